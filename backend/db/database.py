@@ -1,46 +1,147 @@
 """
 Database connection and session management
 """
+import atexit
+import logging
 import os
+import queue
+import time
+import traceback
 from contextlib import contextmanager
-from typing import Generator
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener
+from typing import AsyncGenerator, Generator, List, Optional
 
+from pgvector.utils import HalfVector, Vector
 from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Connection, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import NullPool
 
 from backend.config.settings import settings
 
-# Create engine
+
+def _configure_sql_logging():
+    """
+    Route SQLAlchemy statement logs (DEBUG only) and slow-query warnings through a queue so the
+    stderr writes happen on a listener thread, not on the event loop
+    """
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, logging.StreamHandler())
+    sql_logger = logging.getLogger('sqlalchemy.engine')
+    sql_logger.setLevel(logging.INFO if settings.DEBUG else logging.WARNING)
+    sql_logger.addHandler(QueueHandler(log_queue))
+    sql_logger.propagate = False
+    listener.start()
+    atexit.register(listener.stop)
+
+
+_configure_sql_logging()
+
+# Partial-index predicate for idx_media_embedding. Every vector query
+# (search.semantic_search, chat_service.answer_with_context) must repeat it
+# in its WHERE clause, or the planner cannot use the index.
+EMBEDDING_INDEX_PREDICATE = "status = 'completed' AND embedding IS NOT NULL"
+
+# Connection pool: NullPool in tests, a sized pool of warm connections otherwise
+# (QueuePool for the sync engine, AsyncAdaptedQueuePool for the async one)
+if settings.ENV == 'test':
+    pool_kwargs = {'poolclass': NullPool}
+else:
+    pool_kwargs = {
+        'pool_size': settings.DB_POOL_SIZE,
+        'max_overflow': settings.DB_MAX_OVERFLOW,
+        'pool_recycle': settings.DB_POOL_RECYCLE,  # Drop sockets before Postgres/proxies time them out
+        'pool_timeout': settings.DB_POOL_TIMEOUT,
+    }
+
+# Sync engine (Celery workers, background tasks, schema management)
 engine = create_engine(
     settings.DATABASE_URL,
-    poolclass=NullPool if settings.ENV == 'test' else None,
     pool_pre_ping=True,  # Verify connections before using
-    echo=settings.DEBUG,  # Log SQL queries in debug mode
+    echo=False,  # SQL logging goes through the queued 'sqlalchemy.engine' logger below
+    **pool_kwargs,
 )
 
 # Session factory
 SessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
+    # Workers own the rows they update: no reload after each progress commit
+    expire_on_commit=False,
     bind=engine
 )
 
 
-def get_db() -> Generator[Session, None, None]:
+def _vector_encoder(cls):
+    """Binary pgvector encoder accepting arrays/lists and the text form the ORM types bind"""
+    def encode(value):
+        if isinstance(value, str):
+            value = cls.from_text(value)
+        return cls._to_db_binary(value)
+    return encode
+
+
+async def _register_vector_codecs(conn):
+    """Binary codecs for pgvector types on new asyncpg connections"""
+    for typename, cls in (('vector', Vector), ('halfvec', HalfVector)):
+        try:
+            await conn.set_type_codec(
+                typename,
+                schema='public',
+                encoder=_vector_encoder(cls),
+                decoder=cls._from_db_binary,
+                format='binary',
+            )
+        except ValueError as e:
+            # Extension not installed yet (fresh database before migrate)
+            if not str(e).startswith('unknown type:'):
+                raise
+
+
+def _async_database_url(url: str) -> str:
+    """Point DATABASE_URL at the asyncpg driver (postgresql://... -> postgresql+asyncpg://...)"""
+    return make_url(url).set(drivername='postgresql+asyncpg').render_as_string(hide_password=False)
+
+
+# Async engine (FastAPI gateway) - queries run on the event loop, not the threadpool
+async_engine = create_async_engine(
+    _async_database_url(settings.DATABASE_URL),
+    pool_pre_ping=True,
+    echo=False,
+    # HNSW candidate list size per query (recall vs latency)
+    connect_args={'server_settings': {'hnsw.ef_search': '40'}},
+    **pool_kwargs,
+)
+
+
+@event.listens_for(async_engine.sync_engine, "connect")
+def _on_async_connect(dbapi_connection, connection_record):
+    # numpy query embeddings go over the wire as raw bytes, no float->text formatting
+    dbapi_connection.run_async(_register_vector_codecs)
+
+
+# Async session factory
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
-    FastAPI dependency for database sessions
+    FastAPI dependency for async database sessions
     
     Usage:
         @app.get("/items")
-        def get_items(db: Session = Depends(get_db)):
-            return db.query(MediaItem).all()
+        async def get_items(db: AsyncSession = Depends(get_db)):
+            return (await db.execute(select(MediaItem))).scalars().all()
     """
-    db = SessionLocal()
-    try:
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 
 @contextmanager
@@ -63,35 +164,32 @@ def get_db_context() -> Generator[Session, None, None]:
         db.close()
 
 
+async def check_db_reachable():
+    """Fail fast at startup if the database cannot be reached (no DDL)"""
+    async with async_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+
 def init_db():
     """
     Initialize database: create tables and pgvector extension
     """
     from backend.db.models import Base
     
-    # Enable pgvector extension
-    with engine.connect() as conn:
+    # Extension and tables in a single transaction
+    with engine.begin() as conn:
         conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
-        conn.commit()
+        Base.metadata.create_all(bind=conn)
     
-    # Create all tables
-    Base.metadata.create_all(bind=engine)
-    
-    # Create vector index for embeddings (ivfflat)
-    with engine.connect() as conn:
-        # Check if index exists
-        result = conn.execute(text("""
-            SELECT 1 FROM pg_indexes 
-            WHERE indexname = 'idx_media_embedding'
-        """))
-        if not result.fetchone():
-            conn.execute(text("""
-                CREATE INDEX idx_media_embedding 
-                ON media_items 
-                USING ivfflat (embedding vector_cosine_ops)
-                WITH (lists = 100)
-            """))
-            conn.commit()
+    # Indexes added after the initial schema: built CONCURRENTLY (outside a
+    # transaction) so populated tables stay writable while they build
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_media_status_created "
+            "ON media_items (status, created_at DESC)"
+        ))
+        # Superseded by the composite index above
+        conn.execute(text("DROP INDEX CONCURRENTLY IF EXISTS idx_media_status"))
     
     # Apply SQL migrations
     migrations_dir = os.path.join(os.path.dirname(__file__), 'migrations')
@@ -109,9 +207,42 @@ def init_db():
                     conn.rollback()
                     print(f"⚠️  Migration {mf} skipped: {e}")
 
+    # Vector index last: migrations may change the embedding column type
+    with engine.begin() as conn:
+        _create_embedding_index(conn)
+
     print("✅ Database initialized successfully")
 
 
+def _create_embedding_index(conn: Connection):
+    """
+    Build the ANN index on media_items.embedding
+    
+    HNSW over halfvec (pgvector >= 0.7). Embeddings are stored as FP16 and
+    L2-normalized, so the index uses inner-product ops (queries order by
+    `<#>`). It is partial on EMBEDDING_INDEX_PREDICATE, the only rows search
+    reads; an index with any other definition is rebuilt.
+    """
+    indexdef = conn.execute(text(
+        "SELECT indexdef FROM pg_indexes WHERE indexname = 'idx_media_embedding'"
+    )).scalar()
+    if indexdef is not None:
+        if 'halfvec_ip_ops' in indexdef and 'IS NOT NULL' in indexdef:
+            return
+        conn.execute(text("DROP INDEX idx_media_embedding"))
+    
+    index_sql = f"""
+        CREATE INDEX idx_media_embedding
+        ON media_items
+        USING hnsw (embedding halfvec_ip_ops)
+        WITH (m = 16, ef_construction = 64)
+        WHERE {EMBEDDING_INDEX_PREDICATE}
+    """
+    
+    conn.execute(text("SET LOCAL maintenance_work_mem = '1GB'"))
+    conn.execute(text(index_sql))
+
+
 def drop_db():
     """Drop all tables (USE WITH CAUTION - for development only)"""
     from backend.db.models import Base
@@ -119,9 +250,63 @@ def drop_db():
     print("⚠️  All tables dropped")
 
 
+# Per-request SQL statement counter (DEBUG N+1 detector, see gateway/main.py)
+_query_counter: ContextVar[Optional[List[int]]] = ContextVar('query_counter', default=None)
+
+
+def start_query_count() -> List[int]:
+    """Start counting statements issued from the current context; returns the live counter"""
+    counter = [0]
+    _query_counter.set(counter)
+    return counter
+
+
+# Slow-query log: time every statement, report only those over SLOW_QUERY_MS
+slow_query_logger = logging.getLogger('sqlalchemy.engine.slow')
+
+# Longest parameter repr worth logging (embeddings are 384 floats)
+SLOW_QUERY_PARAMS_CHARS = 500
+
+
+def _caller_frames(limit: int = 3) -> str:
+    """Innermost application frames that led to the statement (empty under asyncpg greenlets)"""
+    this_file = os.path.abspath(__file__)
+    frames = [
+        f for f in traceback.extract_stack()
+        if f'{os.sep}backend{os.sep}' in f.filename and os.path.abspath(f.filename) != this_file
+    ]
+    return ' <- '.join(f'{f.filename}:{f.lineno} {f.name}' for f in reversed(frames[-limit:]))
+
+
+def _start_query_timer(conn, cursor, statement, params, context, executemany):
+    # On the per-execution context, not the pooled connection: a statement
+    # that raises never reaches after_cursor_execute, and its start time is
+    # dropped with its context instead of lingering on the connection
+    if context is not None:
+        context._slow_query_start = time.perf_counter()
+
+
+def _log_slow_query(conn, cursor, statement, params, context, executemany):
+    start = getattr(context, '_slow_query_start', None)
+    if start is None:
+        return
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    if elapsed_ms > settings.SLOW_QUERY_MS:
+        slow_query_logger.warning(
+            "🐢 Slow query (%.0f ms): %s | params=%.*s | at %s",
+            elapsed_ms, statement, SLOW_QUERY_PARAMS_CHARS, repr(params), _caller_frames() or '?',
+        )
+
+
+for _engine in (engine, async_engine.sync_engine):
+    event.listen(_engine, "before_cursor_execute", _start_query_timer)
+    event.listen(_engine, "after_cursor_execute", _log_slow_query)
+
+
 # Event listeners for debugging
 if settings.DEBUG:
-    @event.listens_for(engine, "before_cursor_execute")
-    def receive_before_cursor_execute(conn, cursor, statement, params, context, executemany):
-        print(f"🔍 SQL: {statement}")
-        print(f"📊 Params: {params}")
+    @event.listens_for(async_engine.sync_engine, "before_cursor_execute")
+    def count_async_queries(conn, cursor, statement, params, context, executemany):
+        counter = _query_counter.get()
+        if counter is not None:
+            counter[0] += 1
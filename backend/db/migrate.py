@@ -0,0 +1,27 @@
+"""
+One-shot schema management: python -m backend.db.migrate
+
+Runs init_db() (extension, tables, indexes, SQL migrations) under a Postgres
+advisory lock, so concurrent gateway/worker containers starting together
+apply DDL one at a time instead of racing for table locks.
+"""
+from sqlalchemy import text
+
+from backend.db.database import engine, init_db
+
+# Arbitrary app-wide key for pg_advisory_lock
+MIGRATION_LOCK_ID = 712837
+
+
+def run_migrations():
+    """Apply schema changes while holding the migration advisory lock"""
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as lock_conn:
+        lock_conn.execute(text("SELECT pg_advisory_lock(:id)"), {"id": MIGRATION_LOCK_ID})
+        try:
+            init_db()
+        finally:
+            lock_conn.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": MIGRATION_LOCK_ID})
+
+
+if __name__ == "__main__":
+    run_migrations()
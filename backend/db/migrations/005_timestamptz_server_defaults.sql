@@ -0,0 +1,35 @@
+-- Migration: Timezone-aware timestamps with database-side defaults
+-- Date: 2026-10-15
+-- Description: Convert naive TIMESTAMP columns (stored as UTC) to TIMESTAMPTZ and let
+-- Postgres fill creation times instead of a Python default per row
+
+DO $$
+DECLARE
+    col RECORD;
+BEGIN
+    FOR col IN
+        SELECT table_name, column_name
+        FROM information_schema.columns
+        WHERE table_schema = current_schema()
+          AND data_type = 'timestamp without time zone'
+          AND (table_name, column_name) IN (
+              ('categories', 'created_at'), ('categories', 'updated_at'),
+              ('media_items', 'created_at'), ('media_items', 'updated_at'), ('media_items', 'imported_at'),
+              ('processing_jobs', 'started_at'), ('processing_jobs', 'completed_at'),
+              ('chat_messages', 'timestamp'),
+              ('subscriptions', 'last_checked'), ('subscriptions', 'created_at')
+          )
+    LOOP
+        EXECUTE 'ALTER TABLE ' || quote_ident(col.table_name)
+             || ' ALTER COLUMN ' || quote_ident(col.column_name)
+             || ' TYPE TIMESTAMPTZ USING ' || quote_ident(col.column_name) || ' AT TIME ZONE ''UTC''';
+    END LOOP;
+END $$;
+
+ALTER TABLE categories ALTER COLUMN created_at SET DEFAULT now();
+ALTER TABLE categories ALTER COLUMN updated_at SET DEFAULT now();
+ALTER TABLE media_items ALTER COLUMN created_at SET DEFAULT now();
+ALTER TABLE media_items ALTER COLUMN updated_at SET DEFAULT now();
+ALTER TABLE media_items ALTER COLUMN imported_at SET DEFAULT now();
+ALTER TABLE chat_messages ALTER COLUMN "timestamp" SET DEFAULT clock_timestamp();
+ALTER TABLE subscriptions ALTER COLUMN created_at SET DEFAULT now();
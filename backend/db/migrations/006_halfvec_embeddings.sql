@@ -0,0 +1,19 @@
+-- Migration: Store media embeddings as halfvec (FP16)
+-- Date: 2026-10-15
+-- Description: Halve the bytes read per distance computation. The ANN index
+-- is dropped here and rebuilt with halfvec_ip_ops by init_db. Needs pgvector >= 0.7
+
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_schema = current_schema()
+          AND table_name = 'media_items'
+          AND column_name = 'embedding'
+          AND udt_name = 'vector'
+    ) THEN
+        DROP INDEX IF EXISTS idx_media_embedding;
+        ALTER TABLE media_items
+            ALTER COLUMN embedding TYPE halfvec(384) USING embedding::halfvec(384);
+    END IF;
+END $$;
@@ -0,0 +1,9 @@
+-- Migration: Link duplicate media items to their original
+-- Date: 2026-10-15
+-- Description: A duplicate keeps a reference instead of copies of the original's
+-- transcript, text, summary, tags and embedding; read paths resolve it.
+
+ALTER TABLE media_items
+ADD COLUMN IF NOT EXISTS duplicate_of UUID REFERENCES media_items(id) ON DELETE SET NULL;
+
+COMMENT ON COLUMN media_items.duplicate_of IS 'Original media item when status=duplicate (content is read from it)';
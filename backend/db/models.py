@@ -6,16 +6,20 @@ from typing import List, Optional
 from uuid import uuid4
 
 from sqlalchemy import (
-    String, Integer, Text, TIMESTAMP, Boolean, ARRAY,
-    ForeignKey, Index
+    String, Integer, Text, TIMESTAMP, Boolean,
+    ForeignKey, Index, func, text
 )
-from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.dialects.postgresql import ARRAY, UUID, JSONB
 from sqlalchemy.orm import DeclarativeBase, relationship, Mapped, mapped_column
-from pgvector.sqlalchemy import Vector
+from pgvector.sqlalchemy import HALFVEC, Vector
 
 
 class Base(DeclarativeBase):
-    pass
+    type_annotation_map = {
+        datetime: TIMESTAMP(timezone=True),
+        dict: JSONB,
+        List[str]: ARRAY(String),
+    }
 
 
 class Category(Base):
@@ -34,8 +38,8 @@ class Category(Base):
         UUID(as_uuid=False), ForeignKey('categories.id', ondelete='SET NULL'), nullable=True
     )
 
-    created_at: Mapped[datetime] = mapped_column(TIMESTAMP, default=datetime.utcnow)
-    updated_at: Mapped[datetime] = mapped_column(TIMESTAMP, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(server_default=func.now())
 
     children: Mapped[List["Category"]] = relationship(
         "Category", back_populates="parent", cascade="all, delete-orphan"
@@ -81,20 +85,20 @@ class MediaItem(Base):
 
     # Content
     raw_text: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
-    transcript: Mapped[Optional[dict]] = mapped_column(JSONB, nullable=True)
+    transcript: Mapped[Optional[dict]] = mapped_column(nullable=True)
     ai_summary: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
-    tags: Mapped[Optional[List[str]]] = mapped_column(ARRAY(String), default=list)
+    tags: Mapped[Optional[List[str]]] = mapped_column(default=list)
 
-    # Vector embedding
-    embedding: Mapped[Optional[List[float]]] = mapped_column(Vector(384), nullable=True)
+    # Vector embedding (FP16: half the bytes per distance computation)
+    embedding: Mapped[Optional[List[float]]] = mapped_column(HALFVEC(384), nullable=True)
 
     # Status
     status: Mapped[str] = mapped_column(String(50), default='pending')
 
     # Timestamps
-    created_at: Mapped[datetime] = mapped_column(TIMESTAMP, default=datetime.utcnow)
-    updated_at: Mapped[datetime] = mapped_column(TIMESTAMP, default=datetime.utcnow)
-    imported_at: Mapped[datetime] = mapped_column(TIMESTAMP, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(server_default=func.now())
+    imported_at: Mapped[datetime] = mapped_column(server_default=func.now())
 
     # Storage
     minio_path: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
@@ -112,6 +116,11 @@ class MediaItem(Base):
         UUID(as_uuid=False), ForeignKey('subscriptions.id', ondelete='SET NULL'), nullable=True
     )
 
+    # Duplicate detection: the original this item's content is read from
+    duplicate_of: Mapped[Optional[str]] = mapped_column(
+        UUID(as_uuid=False), ForeignKey('media_items.id', ondelete='SET NULL'), nullable=True
+    )
+
     # Relationships
     category: Mapped[Optional["Category"]] = relationship(
         "Category", back_populates="media_items"
@@ -121,7 +130,8 @@ class MediaItem(Base):
     )
 
     __table_args__ = (
-        Index('idx_media_status', 'status'),
+        # Serves "WHERE status = ? ORDER BY created_at DESC LIMIT n" (also covers status-only lookups)
+        Index('idx_media_status_created', 'status', text('created_at DESC')),
         Index('idx_created_at', 'created_at'),
         Index('idx_tags', 'tags', postgresql_using='gin'),
         Index('idx_media_category', 'category_id'),
@@ -150,8 +160,8 @@ class ProcessingJob(Base):
     retry_count: Mapped[int] = mapped_column(Integer, default=0)
     celery_task_id: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
 
-    started_at: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP, nullable=True)
-    completed_at: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP, nullable=True)
+    started_at: Mapped[Optional[datetime]] = mapped_column(nullable=True)
+    completed_at: Mapped[Optional[datetime]] = mapped_column(nullable=True)
 
     media_item: Mapped["MediaItem"] = relationship("MediaItem", back_populates="processing_jobs")
 
@@ -173,9 +183,10 @@ class ChatMessage(Base):
     )
     role: Mapped[str] = mapped_column(String(20), nullable=False)
     text: Mapped[str] = mapped_column(Text, nullable=False)
-    context_media_ids: Mapped[Optional[List[str]]] = mapped_column(ARRAY(String), default=list)
+    context_media_ids: Mapped[Optional[List[str]]] = mapped_column(default=list)
     embedding: Mapped[Optional[List[float]]] = mapped_column(Vector(384), nullable=True)
-    timestamp: Mapped[datetime] = mapped_column(TIMESTAMP, default=datetime.utcnow)
+    # clock_timestamp(), not now(): a chat turn inserts both messages in one transaction
+    timestamp: Mapped[datetime] = mapped_column(server_default=func.clock_timestamp())
 
     __table_args__ = (
         Index('idx_timestamp', 'timestamp'),
@@ -199,9 +210,9 @@ class Subscription(Base):
     description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     prompt: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     period_days: Mapped[int] = mapped_column(Integer, default=7)
-    last_checked: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP, nullable=True)
+    last_checked: Mapped[Optional[datetime]] = mapped_column(nullable=True)
     sync_enabled: Mapped[bool] = mapped_column(Boolean, default=True)
-    created_at: Mapped[datetime] = mapped_column(TIMESTAMP, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(server_default=func.now())
 
     __table_args__ = (
         Index('idx_sync_enabled', 'sync_enabled'),
@@ -1,33 +1,53 @@
 """
 FastAPI Gateway - Main Application
 """
+import asyncio
 from contextlib import asynccontextmanager
+import redis.asyncio as aioredis
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 
-from backend.config.settings import settings
-from backend.db.database import init_db
+from backend.config.settings import get_settings
+from backend.db.database import check_db_reachable, start_query_count
+from backend.storage.minio_client import MinIOClient
 from backend.gateway.routers import media, search, chat, health, websocket, subscriptions, categories, notes
 
+settings = get_settings()
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Startup and shutdown events"""
     # Startup
     print("🚀 Starting Nexus Gateway...")
-    init_db()
-    print("✅ Database initialized")
+    # Schema is managed by `python -m backend.db.migrate`, run once before the workers start
+    await check_db_reachable()
+    print("✅ Database reachable")
+    # Shared Redis connection pool (health checks etc.)
+    app.state.redis = aioredis.from_url(
+        settings.REDIS_URL,
+        max_connections=32,
+        health_check_interval=30
+    )
+    # Shared MinIO client (keeps its HTTP connection pool warm across uploads)
+    app.state.minio = MinIOClient()
+    # Push worker job status events to WebSocket subscribers
+    job_events_task = asyncio.create_task(websocket.relay_job_events(app.state.redis))
     yield
     # Shutdown
     print("👋 Shutting down Nexus Gateway...")
+    job_events_task.cancel()
+    await asyncio.gather(job_events_task, return_exceptions=True)
+    await app.state.redis.aclose()
 
 
 app = FastAPI(
     title="Nexus API",
     description="Media Archive with AI Processing",
     version="2.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -39,6 +59,16 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Dev-only N+1 detector: flag requests that issue too many SQL statements
+if settings.DEBUG:
+    @app.middleware("http")
+    async def warn_on_query_count(request, call_next):
+        counter = start_query_count()
+        response = await call_next(request)
+        if counter[0] > settings.DB_QUERY_WARN_THRESHOLD:
+            print(f"⚠️  {request.method} {request.url.path} issued {counter[0]} SQL queries")
+        return response
+
 # Include routers
 app.include_router(health.router, prefix=settings.API_PREFIX, tags=["health"])
 app.include_router(media.router, prefix=settings.API_PREFIX, tags=["media"])
@@ -53,7 +83,7 @@ app.include_router(notes.router, prefix=settings.API_PREFIX, tags=["notes"])
 # Global exception handler
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={"error": str(exc), "type": type(exc).__name__}
     )
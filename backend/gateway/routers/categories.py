@@ -7,7 +7,8 @@ from uuid import uuid4
 
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.db.database import get_db
 from backend.db.models import Category, MediaItem
@@ -47,15 +48,21 @@ class CategoryResponse(BaseModel):
         from_attributes = True
 
 
+async def _count_items(db: AsyncSession, category_id: str) -> int:
+    return await db.scalar(
+        select(func.count()).select_from(MediaItem).where(MediaItem.category_id == category_id)
+    )
+
+
 # ── Endpoints ─────────────────────────────────────────────────────────────────
 
 @router.get("/categories", response_model=List[CategoryResponse])
-def list_categories(db: Session = Depends(get_db)):
+async def list_categories(db: AsyncSession = Depends(get_db)):
     """List all categories with item counts."""
-    categories = db.query(Category).order_by(Category.name).all()
+    categories = (await db.execute(select(Category).order_by(Category.name))).scalars().all()
     result = []
     for cat in categories:
-        count = db.query(MediaItem).filter(MediaItem.category_id == cat.id).count()
+        count = await _count_items(db, cat.id)
         result.append(CategoryResponse(
             id=cat.id,
             name=cat.name,
@@ -70,10 +77,10 @@ def list_categories(db: Session = Depends(get_db)):
 
 
 @router.post("/categories", response_model=CategoryResponse, status_code=201)
-def create_category(payload: CategoryCreate, db: Session = Depends(get_db)):
+async def create_category(payload: CategoryCreate, db: AsyncSession = Depends(get_db)):
     """Create a new category / folder."""
     if payload.parent_id:
-        parent = db.query(Category).filter(Category.id == payload.parent_id).first()
+        parent = await db.get(Category, payload.parent_id)
         if not parent:
             raise HTTPException(status_code=404, detail="Parent category not found")
 
@@ -86,8 +93,8 @@ def create_category(payload: CategoryCreate, db: Session = Depends(get_db)):
         parent_id=payload.parent_id,
     )
     db.add(cat)
-    db.commit()
-    db.refresh(cat)
+    await db.commit()
+    await db.refresh(cat)
     return CategoryResponse(
         id=cat.id, name=cat.name, description=cat.description,
         color=cat.color, icon=cat.icon, parent_id=cat.parent_id,
@@ -96,11 +103,11 @@ def create_category(payload: CategoryCreate, db: Session = Depends(get_db)):
 
 
 @router.get("/categories/{category_id}", response_model=CategoryResponse)
-def get_category(category_id: str, db: Session = Depends(get_db)):
-    cat = db.query(Category).filter(Category.id == category_id).first()
+async def get_category(category_id: str, db: AsyncSession = Depends(get_db)):
+    cat = await db.get(Category, category_id)
     if not cat:
         raise HTTPException(status_code=404, detail="Category not found")
-    count = db.query(MediaItem).filter(MediaItem.category_id == cat.id).count()
+    count = await _count_items(db, cat.id)
     return CategoryResponse(
         id=cat.id, name=cat.name, description=cat.description,
         color=cat.color, icon=cat.icon, parent_id=cat.parent_id,
@@ -109,19 +116,19 @@ def get_category(category_id: str, db: Session = Depends(get_db)):
 
 
 @router.patch("/categories/{category_id}", response_model=CategoryResponse)
-def update_category(
-    category_id: str, payload: CategoryUpdate, db: Session = Depends(get_db)
+async def update_category(
+    category_id: str, payload: CategoryUpdate, db: AsyncSession = Depends(get_db)
 ):
-    cat = db.query(Category).filter(Category.id == category_id).first()
+    cat = await db.get(Category, category_id)
     if not cat:
         raise HTTPException(status_code=404, detail="Category not found")
 
     for field, value in payload.model_dump(exclude_none=True).items():
         setattr(cat, field, value)
-    cat.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(cat)
-    count = db.query(MediaItem).filter(MediaItem.category_id == cat.id).count()
+    cat.updated_at = func.now()
+    await db.commit()
+    await db.refresh(cat)
+    count = await _count_items(db, cat.id)
     return CategoryResponse(
         id=cat.id, name=cat.name, description=cat.description,
         color=cat.color, icon=cat.icon, parent_id=cat.parent_id,
@@ -130,14 +137,14 @@ def update_category(
 
 
 @router.delete("/categories/{category_id}")
-def delete_category(category_id: str, db: Session = Depends(get_db)):
-    cat = db.query(Category).filter(Category.id == category_id).first()
+async def delete_category(category_id: str, db: AsyncSession = Depends(get_db)):
+    cat = await db.get(Category, category_id)
     if not cat:
         raise HTTPException(status_code=404, detail="Category not found")
     # Unlink items
-    db.query(MediaItem).filter(MediaItem.category_id == category_id).update(
-        {"category_id": None}
+    await db.execute(
+        update(MediaItem).where(MediaItem.category_id == category_id).values(category_id=None)
     )
-    db.delete(cat)
-    db.commit()
+    await db.delete(cat)
+    await db.commit()
     return {"status": "deleted", "category_id": category_id}
@@ -1,18 +1,23 @@
 """
 Chat with archive endpoints
 """
-from typing import List
+from typing import Dict, List
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
 from pydantic import BaseModel
 
 from backend.db.database import get_db
 from backend.db.models import ChatMessage, MediaItem
 from backend.services.chat_service import answer_with_context
-from backend.config.settings import settings
+from backend.config.settings import Settings, provide_settings
 
 router = APIRouter()
 
+# Static statement, built once at import
+CLEAR_HISTORY_STMT = delete(ChatMessage).execution_options(synchronize_session=False)
+
 
 class ChatRequest(BaseModel):
     message: str
@@ -24,10 +29,25 @@ class ChatResponse(BaseModel):
     context_media_ids: List[str]
 
 
+async def fetch_media_batch(db: AsyncSession, ids: List[str]) -> Dict[str, MediaItem]:
+    """
+    Load the media items referenced by chat messages in one query (avoids N+1)
+    """
+    if not ids:
+        return {}
+    result = await db.execute(
+        select(MediaItem)
+        .options(load_only(MediaItem.id, MediaItem.title, MediaItem.type))
+        .where(MediaItem.id.in_(ids))
+    )
+    return {item.id: item for item in result.scalars()}
+
+
 @router.post("/chat", response_model=ChatResponse)
 async def chat(
     request: ChatRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    settings: Settings = Depends(provide_settings),
 ):
     """
     Chat with Nexus AI using archive context
@@ -37,13 +57,12 @@ async def chat(
             status_code=503,
             detail="No LLM API key configured. Set GEMINI_API_KEY or OPENAI_API_KEY."
         )
-    # Save user message
+    # Stage user message (committed together with the reply below)
     user_msg = ChatMessage(
         role="user",
         text=request.message
     )
     db.add(user_msg)
-    db.commit()
     
     # Get response with context
     try:
@@ -53,19 +72,20 @@ async def chat(
             max_context_items=request.max_context_items
         )
     except Exception as e:
+        await db.rollback()
         raise HTTPException(
             status_code=502,
             detail=f"LLM request failed: {str(e)}"
         )
     
-    # Save assistant message
+    # Save both messages in a single transaction
     assistant_msg = ChatMessage(
         role="assistant",
         text=response_text,
         context_media_ids=context_ids
     )
     db.add(assistant_msg)
-    db.commit()
+    await db.commit()
     
     return {
         "response": response_text,
@@ -77,24 +97,44 @@ async def chat(
 async def get_chat_history(
     skip: int = 0,
     limit: int = 50,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get chat history
     """
-    messages = db.query(ChatMessage).order_by(
-        ChatMessage.timestamp.desc()
-    ).offset(skip).limit(limit).all()
+    result = await db.execute(
+        select(
+            ChatMessage.id,
+            ChatMessage.role,
+            ChatMessage.text,
+            ChatMessage.context_media_ids,
+            ChatMessage.timestamp,
+        ).order_by(
+            ChatMessage.timestamp.desc()
+        ).offset(skip).limit(limit)
+    )
+    messages = [dict(row) for row in result.mappings()]
+    
+    # Expand context media for the whole page at once
+    media_ids = {mid for m in messages for mid in (m["context_media_ids"] or [])}
+    media_by_id = await fetch_media_batch(db, list(media_ids))
+    for m in messages:
+        m["context_media"] = [
+            {"id": mid, "title": media_by_id[mid].title, "type": media_by_id[mid].type}
+            for mid in (m["context_media_ids"] or [])
+            if mid in media_by_id
+        ]
     
     return messages
 
 
 @router.delete("/chat/history")
-async def clear_chat_history(db: Session = Depends(get_db)):
+async def clear_chat_history(db: AsyncSession = Depends(get_db)):
     """
     Clear all chat history
     """
-    count = db.query(ChatMessage).delete()
-    db.commit()
+    result = await db.execute(CLEAR_HISTORY_STMT)
+    await db.commit()
+    count = result.rowcount
     
     return {"status": "cleared", "messages_deleted": count}
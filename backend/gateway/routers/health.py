@@ -1,18 +1,20 @@
 """
 Health check endpoints
 """
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 
 from backend.db.database import get_db
-from backend.config.settings import settings
+from backend.config.settings import Settings, provide_settings
 
 router = APIRouter()
 
+PING_STMT = text("SELECT 1")
+
 
 @router.get("/health")
-async def health_check():
+async def health_check(settings: Settings = Depends(provide_settings)):
     """Basic health check"""
     return {
         "status": "ok",
@@ -22,22 +24,20 @@ async def health_check():
 
 
 @router.get("/health/db")
-async def database_health(db: Session = Depends(get_db)):
+async def database_health(db: AsyncSession = Depends(get_db)):
     """Check database connectivity"""
     try:
-        db.execute(text("SELECT 1"))
+        await db.execute(PING_STMT)
         return {"status": "ok", "database": "connected"}
     except Exception as e:
         return {"status": "error", "database": "disconnected", "error": str(e)}
 
 
 @router.get("/health/redis")
-async def redis_health():
+async def redis_health(request: Request):
     """Check Redis connectivity"""
-    import redis
     try:
-        r = redis.from_url(settings.REDIS_URL)
-        r.ping()
+        await request.app.state.redis.ping()
         return {"status": "ok", "redis": "connected"}
     except Exception as e:
         return {"status": "error", "redis": "disconnected", "error": str(e)}
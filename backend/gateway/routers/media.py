@@ -1,40 +1,69 @@
 """
 Media processing endpoints
 """
+import asyncio
+import os
+import re
 from datetime import datetime
+from functools import lru_cache
 from typing import List, Optional, Tuple
 from urllib.parse import urlparse
 from uuid import uuid4
 
-from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException, Request
+from sqlalchemy import bindparam, case, func, lambda_stmt, select, update
+from sqlalchemy.orm import aliased
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel, HttpUrl
 
 from backend.db.database import get_db
 from backend.db.models import MediaItem, ProcessingJob
+from backend.services.job_events import get_progress
 from backend.workers.tasks import process_media_task
 
 router = APIRouter()
 
+# List views only carry a preview of raw_text (the feed detail modal shows up to 3000 chars);
+# the full text is served by GET /media/{media_id}
+LIST_RAW_TEXT_CHARS = 3000
+
+# Hot single-row lookups, built and compiled once (cached by lambda identity)
+GET_MEDIA_STMT = lambda_stmt(
+    lambda: select(MediaItem).where(MediaItem.id == bindparam('media_id'))
+)
+GET_JOB_BY_MEDIA_STMT = lambda_stmt(
+    lambda: select(ProcessingJob).where(ProcessingJob.media_id == bindparam('media_id')).limit(1)
+)
+
 
 # Request/Response models
 class ProcessUrlRequest(BaseModel):
     url: HttpUrl
     title: Optional[str] = None
+
+
+# Host suffix -> (media type, source type)
+_HOST_MAP = {
+    'youtube.com': ('youtube', 'youtube_url'),
+    'youtu.be': ('youtube', 'youtube_url'),
+    'instagram.com': ('instagram', 'instagram_url'),
+}
+_FEED_PATH_RE = re.compile(r'\.xml$|rss|feed')
+
+
+@lru_cache(maxsize=1024)
 def classify_url(url: str) -> Tuple[str, str]:
-    host = urlparse(url).netloc.lower()
-    path = urlparse(url).path.lower()
-
-    if 'youtube.com' in host or 'youtu.be' in host:
-        return 'youtube', 'youtube_url'
-    if 'instagram.com' in host:
-        return 'instagram', 'instagram_url'
-    if path.endswith('.xml') or 'rss' in path or 'feed' in path:
+    parsed = urlparse(url)
+    host = parsed.hostname or ''
+
+    for suffix, kind in _HOST_MAP.items():
+        if host.endswith(suffix):
+            return kind
+    if _FEED_PATH_RE.search(parsed.path.lower()):
         return 'web', 'rss_url'
     return 'web', 'web_url'
 
 
-
 class MediaResponse(BaseModel):
     id: str
     title: str
@@ -55,10 +84,82 @@ class MediaResponse(BaseModel):
         from_attributes = True
 
 
+# Duplicates store no content of their own; it is read from the original
+DUPLICATE_SOURCE = aliased(MediaItem, name='original')
+# Content fields a duplicate takes from its original
+DUPLICATE_CONTENT_FIELDS = ('raw_text', 'ai_summary', 'tags')
+# Everything a duplicate needs to stand in for a deleted original
+PROMOTED_CONTENT_FIELDS = DUPLICATE_CONTENT_FIELDS + ('transcript', 'embedding')
+
+
+def _resolved(name: str):
+    return case(
+        (MediaItem.duplicate_of.is_not(None), getattr(DUPLICATE_SOURCE, name)),
+        else_=getattr(MediaItem, name),
+    )
+
+
+# Project only MediaResponse columns - skips embedding / transcript payloads.
+# Select them with .select_from(MEDIA_LIST_FROM) so duplicates resolve
+MEDIA_LIST_COLUMNS = (
+    MediaItem.id,
+    MediaItem.title,
+    MediaItem.type,
+    MediaItem.source_type,
+    MediaItem.source_url,
+    MediaItem.duration,
+    func.left(_resolved('raw_text'), LIST_RAW_TEXT_CHARS).label('raw_text'),
+    _resolved('ai_summary').label('ai_summary'),
+    _resolved('tags').label('tags'),
+    MediaItem.status,
+    MediaItem.created_at,
+    MediaItem.origin,
+    MediaItem.subscription_id,
+    MediaItem.category_id,
+)
+MEDIA_LIST_FROM = MediaItem.__table__.outerjoin(
+    DUPLICATE_SOURCE, DUPLICATE_SOURCE.id == MediaItem.duplicate_of
+)
+
+
+async def _create_and_enqueue_job(db: AsyncSession, media_id: str) -> dict:
+    """
+    Create the processing job and enqueue the pipeline
+    
+    The Celery task id is generated up front so the media item, the job and
+    its task id are persisted in a single commit before publishing.
+    """
+    job_id = str(uuid4())
+    task_id = str(uuid4())
+    job = ProcessingJob(
+        id=job_id,
+        media_id=media_id,
+        status="pending",
+        celery_task_id=task_id
+    )
+    db.add(job)
+    await db.commit()
+    
+    try:
+        process_media_task.apply_async(args=[job_id], task_id=task_id)
+    except Exception as e:
+        job.status = "error"
+        job.error_message = f"Failed to queue processing: {str(e)}"
+        await db.commit()
+        raise HTTPException(status_code=503, detail="Task queue unavailable")
+    
+    return {
+        "job_id": job_id,
+        "media_id": media_id,
+        "status": "queued",
+        "celery_task_id": task_id
+    }
+
+
 @router.post("/media/process/url")
 async def process_url(
     request: ProcessUrlRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Process media from URL (YouTube, etc.)
@@ -76,62 +177,33 @@ async def process_url(
     )
     db.add(media_item)
     
-    # Create processing job
-    job_id = str(uuid4())
-    job = ProcessingJob(
-        id=job_id,
-        media_id=media_id,
-        status="pending"
-    )
-    db.add(job)
-    db.commit()
-    
-    # Enqueue Celery task
-    task = process_media_task.delay(job_id)
-    job.celery_task_id = task.id
-    db.commit()
-    
-    return {
-        "job_id": job_id,
-        "media_id": media_id,
-        "status": "queued",
-        "celery_task_id": task.id
-    }
+    return await _create_and_enqueue_job(db, media_id)
 
 
 @router.post("/media/process/upload")
 async def process_upload(
+    request: Request,
     file: UploadFile = File(...),
     title: Optional[str] = Form(None),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Process uploaded audio file
     """
-    from backend.storage.minio_client import MinIOClient
-    
     # Generate media ID
     media_id = str(uuid4())
     
-    # Save file content to memory first
-    content = await file.read()
-    
-    # Upload to MinIO immediately
-    import tempfile
-    import os
-    with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(file.filename)[1]) as tmp:
-        tmp.write(content)
-        tmp_path = tmp.name
-    
-    try:
-        minio_client = MinIOClient()
-        minio_path = minio_client.upload_audio(
-            file_path=tmp_path,
-            media_id=media_id
-        )
-    finally:
-        # Clean up temp file
-        os.remove(tmp_path)
+    # Stream the spooled upload straight to MinIO (no full read / tempfile copy)
+    extension = os.path.splitext(file.filename or '')[1] or '.wav'
+    minio_client = request.app.state.minio
+    minio_path = await asyncio.to_thread(
+        minio_client.upload_audio_stream,
+        file.file,
+        media_id,
+        length=file.size if file.size is not None else -1,
+        extension=extension,
+        content_type=file.content_type or 'application/octet-stream',
+    )
     
     # Create media item with MinIO path
     media_item = MediaItem(
@@ -144,27 +216,8 @@ async def process_upload(
     )
     db.add(media_item)
     
-    # Create processing job
-    job_id = str(uuid4())
-    job = ProcessingJob(
-        id=job_id,
-        media_id=media_id,
-        status="pending"
-    )
-    db.add(job)
-    db.commit()
-    
     # Enqueue task (no file_path needed - will use MinIO)
-    task = process_media_task.delay(job_id)
-    job.celery_task_id = task.id
-    db.commit()
-    
-    return {
-        "job_id": job_id,
-        "media_id": media_id,
-        "status": "queued",
-        "celery_task_id": task.id
-    }
+    return await _create_and_enqueue_job(db, media_id)
 
 
 @router.get("/media", response_model=List[MediaResponse])
@@ -174,64 +227,105 @@ async def list_media(
     status: Optional[str] = None,
     category_id: Optional[str] = None,
     type: Optional[str] = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     List all media items (excludes plain text notes — use /notes for those)
     """
-    query = db.query(MediaItem).filter(MediaItem.type != 'note')
+    query = select(*MEDIA_LIST_COLUMNS).select_from(MEDIA_LIST_FROM).where(MediaItem.type != 'note')
     if status:
-        query = query.filter(MediaItem.status == status)
+        query = query.where(MediaItem.status == status)
     if category_id:
-        query = query.filter(MediaItem.category_id == category_id)
+        query = query.where(MediaItem.category_id == category_id)
     if type:
-        query = query.filter(MediaItem.type == type)
+        query = query.where(MediaItem.type == type)
 
-    items = query.order_by(MediaItem.created_at.desc()).offset(skip).limit(limit).all()
-    return items
+    result = await db.execute(
+        query.order_by(MediaItem.created_at.desc()).offset(skip).limit(limit)
+    )
+    return [MediaResponse.model_validate(row) for row in result.all()]
 
 
 @router.get("/media/{media_id}", response_model=MediaResponse)
-async def get_media(media_id: str, db: Session = Depends(get_db)):
+async def get_media(media_id: str, db: AsyncSession = Depends(get_db)):
     """
     Get single media item
     """
-    item = db.query(MediaItem).filter(MediaItem.id == media_id).first()
+    result = await db.execute(GET_MEDIA_STMT, {"media_id": media_id})
+    item = result.scalar_one_or_none()
     if not item:
         raise HTTPException(status_code=404, detail="Media not found")
+    if item.duplicate_of:
+        original = await db.get(MediaItem, item.duplicate_of)
+        if original is not None:
+            return MediaResponse.model_validate(item).model_copy(update={
+                name: getattr(original, name) for name in DUPLICATE_CONTENT_FIELDS
+            })
     return item
 
 
 @router.delete("/media/{media_id}")
-async def delete_media(media_id: str, db: Session = Depends(get_db)):
+async def delete_media(media_id: str, db: AsyncSession = Depends(get_db)):
     """
     Delete media item
     """
-    item = db.query(MediaItem).filter(MediaItem.id == media_id).first()
+    result = await db.execute(GET_MEDIA_STMT, {"media_id": media_id})
+    item = result.scalar_one_or_none()
     if not item:
         raise HTTPException(status_code=404, detail="Media not found")
     
-    db.delete(item)
-    db.commit()
+    # Duplicates hold no content of their own: the oldest one takes over as
+    # the original (the MinIO object is already shared) and the rest follow it
+    result = await db.execute(
+        select(MediaItem).where(MediaItem.duplicate_of == item.id)
+        .order_by(MediaItem.created_at).limit(1)
+    )
+    heir = result.scalar_one_or_none()
+    if heir is not None:
+        await db.execute(
+            update(MediaItem)
+            .where(MediaItem.duplicate_of == item.id, MediaItem.id != heir.id)
+            .values(duplicate_of=heir.id)
+        )
+        for name in PROMOTED_CONTENT_FIELDS:
+            setattr(heir, name, getattr(item, name))
+        heir.status = item.status
+        heir.duplicate_of = None
+    
+    await db.delete(item)
+    await db.commit()
     
     return {"status": "deleted", "media_id": media_id}
 
 
 @router.get("/media/{media_id}/job")
-async def get_job_status(media_id: str, db: Session = Depends(get_db)):
+async def get_job_status(
+    media_id: str,
+    request: Request,
+    db: AsyncSession = Depends(get_db)
+):
     """
     Get processing job status for media item
+    
+    While the pipeline runs, status/stage/progress come from Redis (workers
+    only commit terminal states)
     """
-    job = db.query(ProcessingJob).filter(ProcessingJob.media_id == media_id).first()
+    result = await db.execute(GET_JOB_BY_MEDIA_STMT, {"media_id": media_id})
+    job = result.scalars().first()
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
+    status, current_stage, progress_percent = job.status, job.current_stage, job.progress_percent
+    progress = await get_progress(request.app.state.redis, job.id)
+    if progress is not None:
+        status, current_stage, progress_percent = progress["status"], progress["stage"], progress["progress"]
+    
     return {
         "job_id": job.id,
         "media_id": job.media_id,
-        "status": job.status,
-        "current_stage": job.current_stage,
-        "progress_percent": job.progress_percent,
+        "status": status,
+        "current_stage": current_stage,
+        "progress_percent": progress_percent,
         "error_message": job.error_message,
         "celery_task_id": job.celery_task_id
     }
@@ -7,7 +7,9 @@ from uuid import uuid4
 
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import defer
 
 from backend.db.database import get_db
 from backend.db.models import MediaItem
@@ -53,11 +55,14 @@ class NoteResponse(BaseModel):
 def _enrich_note(media_id: str, text: str):
     """Generate embedding + AI summary for a note in the background."""
     from backend.db.database import get_db_context
-    from backend.services.gemini_service import GeminiService
+    from backend.services.gemini_service import get_gemini_service
     from backend.config.settings import settings
 
     with get_db_context() as db:
-        item = db.query(MediaItem).filter(MediaItem.id == media_id).first()
+        # The text is passed in; the stored payload columns are only written
+        item = db.query(MediaItem).filter(MediaItem.id == media_id).options(
+            defer(MediaItem.raw_text), defer(MediaItem.transcript), defer(MediaItem.embedding)
+        ).first()
         if not item:
             return
 
@@ -71,7 +76,7 @@ def _enrich_note(media_id: str, text: str):
         enriched = None
         if settings.GEMINI_API_KEY:
             try:
-                gemini = GeminiService()
+                gemini = get_gemini_service()
                 enriched = gemini.enrich_transcript(text[:4000])
             except Exception:
                 pass
@@ -98,16 +103,23 @@ def _enrich_note(media_id: str, text: str):
                 item.tags = list(set(existing + enriched['tags']))
 
         item.status = 'completed'
-        item.updated_at = datetime.utcnow()
+        item.updated_at = func.now()
+
+
+async def _get_note(db: AsyncSession, note_id: str) -> Optional[MediaItem]:
+    result = await db.execute(
+        select(MediaItem).where(MediaItem.id == note_id, MediaItem.type == 'note')
+    )
+    return result.scalar_one_or_none()
 
 
 # ── Endpoints ─────────────────────────────────────────────────────────────────
 
 @router.post("/notes", response_model=NoteResponse, status_code=201)
-def create_note(
+async def create_note(
     payload: NoteCreate,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Create a plain-text note and enrich it asynchronously."""
     note_id = str(uuid4())
@@ -123,8 +135,8 @@ def create_note(
         origin='manual',
     )
     db.add(note)
-    db.commit()
-    db.refresh(note)
+    await db.commit()
+    await db.refresh(note)
 
     # Enrich in background
     background_tasks.add_task(_enrich_note, note_id, payload.content)
@@ -133,40 +145,38 @@ def create_note(
 
 
 @router.get("/notes", response_model=List[NoteResponse])
-def list_notes(
+async def list_notes(
     skip: int = 0,
     limit: int = 50,
     category_id: Optional[str] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """List all text notes."""
-    query = db.query(MediaItem).filter(MediaItem.type == 'note')
+    query = select(MediaItem).where(MediaItem.type == 'note')
     if category_id:
-        query = query.filter(MediaItem.category_id == category_id)
-    items = query.order_by(MediaItem.created_at.desc()).offset(skip).limit(limit).all()
-    return items
+        query = query.where(MediaItem.category_id == category_id)
+    result = await db.execute(
+        query.order_by(MediaItem.created_at.desc()).offset(skip).limit(limit)
+    )
+    return result.scalars().all()
 
 
 @router.get("/notes/{note_id}", response_model=NoteResponse)
-def get_note(note_id: str, db: Session = Depends(get_db)):
-    item = db.query(MediaItem).filter(
-        MediaItem.id == note_id, MediaItem.type == 'note'
-    ).first()
+async def get_note(note_id: str, db: AsyncSession = Depends(get_db)):
+    item = await _get_note(db, note_id)
     if not item:
         raise HTTPException(status_code=404, detail="Note not found")
     return item
 
 
 @router.patch("/notes/{note_id}", response_model=NoteResponse)
-def update_note(
+async def update_note(
     note_id: str,
     payload: NoteUpdate,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
-    item = db.query(MediaItem).filter(
-        MediaItem.id == note_id, MediaItem.type == 'note'
-    ).first()
+    item = await _get_note(db, note_id)
     if not item:
         raise HTTPException(status_code=404, detail="Note not found")
 
@@ -181,9 +191,9 @@ def update_note(
     if payload.category_id is not None:
         item.category_id = payload.category_id
 
-    item.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(item)
+    item.updated_at = func.now()
+    await db.commit()
+    await db.refresh(item)
 
     if re_enrich:
         background_tasks.add_task(_enrich_note, note_id, item.raw_text)
@@ -192,12 +202,10 @@ def update_note(
 
 
 @router.delete("/notes/{note_id}")
-def delete_note(note_id: str, db: Session = Depends(get_db)):
-    item = db.query(MediaItem).filter(
-        MediaItem.id == note_id, MediaItem.type == 'note'
-    ).first()
+async def delete_note(note_id: str, db: AsyncSession = Depends(get_db)):
+    item = await _get_note(db, note_id)
     if not item:
         raise HTTPException(status_code=404, detail="Note not found")
-    db.delete(item)
-    db.commit()
+    await db.delete(item)
+    await db.commit()
     return {"status": "deleted", "note_id": note_id}
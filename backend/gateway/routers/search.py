@@ -3,13 +3,14 @@ Semantic search endpoints
 """
 from typing import List
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy import Integer, bindparam, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 
 from backend.db.database import get_db
 from backend.db.models import MediaItem
-from backend.services.embeddings import generate_embedding
+from backend.gateway.routers.media import MEDIA_LIST_COLUMNS, MEDIA_LIST_FROM, MediaResponse
+from backend.services.embeddings import generate_embedding_async
 
 router = APIRouter()
 
@@ -31,71 +32,71 @@ class SearchResult(BaseModel):
         from_attributes = True
 
 
+# Vector similarity search. Embeddings are unit-length, so cosine similarity
+# is the plain dot product: -(a <#> b). Plain ORDER BY ... LIMIT keeps the
+# planner on the ANN index; the threshold is applied afterwards.
+# The WHERE clause must keep matching EMBEDDING_INDEX_PREDICATE (db/database.py).
+# Built once at import; asyncpg caches the prepared statement per connection.
+# Rows come back already shaped like SearchResult (no per-row rebuild in Python)
+SEMANTIC_SEARCH_STMT = text("""
+    SELECT 
+        id::text AS id, 
+        COALESCE(title, '') AS title, 
+        COALESCE(ai_summary, '') AS ai_summary, 
+        COALESCE(tags, '{}') AS tags,
+        ROUND((-(embedding <#> CAST(:embedding AS halfvec)))::numeric, 3)::float8 AS similarity
+    FROM media_items
+    WHERE 
+        embedding IS NOT NULL
+        AND status = 'completed'
+    ORDER BY embedding <#> CAST(:embedding AS halfvec)
+    LIMIT :limit
+""").bindparams(bindparam('embedding'), bindparam('limit', type_=Integer))
+
+
 @router.post("/search", response_model=List[SearchResult])
 async def semantic_search(
     request: SearchRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Semantic search across all media using pgvector
     """
     # Generate embedding for query
-    query_embedding = generate_embedding(request.query)
-    
-    # Convert to PostgreSQL array format
-    embedding_str = "[" + ",".join(map(str, query_embedding)) + "]"
-    
-    # Perform vector similarity search
-    query = text("""
-        SELECT 
-            id, 
-            title, 
-            ai_summary, 
-            tags,
-            1 - (embedding <=> CAST(:embedding AS vector)) AS similarity
-        FROM media_items
-        WHERE 
-            embedding IS NOT NULL
-            AND status = 'completed'
-            AND (1 - (embedding <=> CAST(:embedding AS vector))) >= :min_similarity
-        ORDER BY embedding <=> CAST(:embedding AS vector)
-        LIMIT :limit
-    """)
+    query_embedding = await generate_embedding_async(request.query)
     
-    results = db.execute(
-        query,
+    result = await db.execute(
+        SEMANTIC_SEARCH_STMT,
         {
-            "embedding": embedding_str,
-            "min_similarity": request.min_similarity,
+            "embedding": query_embedding,
             "limit": request.limit
         }
-    ).fetchall()
+    )
     
     return [
-        {
-            "id": str(row.id),
-            "title": row.title or "",
-            "ai_summary": row.ai_summary or "",
-            "tags": row.tags or [],
-            "similarity": round(float(row.similarity), 3)
-        }
-        for row in results
+        row for row in result.mappings()
+        if row["similarity"] >= request.min_similarity
     ]
 
 
-@router.get("/search/tags/{tag}")
+@router.get("/search/tags/{tag}", response_model=List[MediaResponse])
 async def search_by_tag(
     tag: str,
     skip: int = 0,
     limit: int = 50,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Search media items by tag
+    
+    tags @> ARRAY[:tag] is served by the idx_tags GIN index; completed rows
+    in created_at order by idx_media_status_created
     """
-    items = db.query(MediaItem).filter(
-        MediaItem.tags.contains([tag]),
-        MediaItem.status == "completed"
-    ).order_by(MediaItem.created_at.desc()).offset(skip).limit(limit).all()
+    result = await db.execute(
+        select(*MEDIA_LIST_COLUMNS).select_from(MEDIA_LIST_FROM).where(
+            MediaItem.tags.contains([tag]),
+            MediaItem.status == "completed"
+        ).order_by(MediaItem.created_at.desc()).offset(skip).limit(limit)
+    )
     
-    return items
+    return [MediaResponse.model_validate(row) for row in result.all()]
@@ -6,7 +6,9 @@ from datetime import datetime
 from uuid import uuid4
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel, HttpUrl, conint
 
 from backend.db.database import get_db
@@ -50,39 +52,37 @@ class SubscriptionResponse(BaseModel):
 
 
 @router.get("/subscriptions", response_model=List[SubscriptionResponse])
-async def list_subscriptions(db: Session = Depends(get_db)):
+async def list_subscriptions(db: AsyncSession = Depends(get_db)):
     """Get all subscriptions"""
-    subscriptions = db.query(Subscription).all()
-    return subscriptions
+    result = await db.execute(select(Subscription))
+    return result.scalars().all()
 
 
 @router.post("/subscriptions", response_model=SubscriptionResponse)
 async def create_subscription(
     subscription: SubscriptionCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Create new subscription"""
-    # Check for duplicates
-    existing = db.query(Subscription).filter(
-        Subscription.url == str(subscription.url)
-    ).first()
-    
-    if existing:
-        raise HTTPException(status_code=409, detail="Subscription already exists")
-    
-    new_sub = Subscription(
-        id=str(uuid4()),
-        url=str(subscription.url),
-        title=subscription.title,
-        type=subscription.type,
-        description=subscription.description,
-        prompt=subscription.prompt,
-        period_days=subscription.period_days,
-        sync_enabled=True
+    # Single round trip: the unique index on url resolves duplicates (no check-then-insert race)
+    new_sub = await db.scalar(
+        insert(Subscription)
+        .values(
+            id=str(uuid4()),
+            url=str(subscription.url),
+            title=subscription.title,
+            type=subscription.type,
+            description=subscription.description,
+            prompt=subscription.prompt,
+            period_days=subscription.period_days,
+            sync_enabled=True
+        )
+        .on_conflict_do_nothing(index_elements=[Subscription.url])
+        .returning(Subscription)
     )
-    db.add(new_sub)
-    db.commit()
-    db.refresh(new_sub)
+    if new_sub is None:
+        raise HTTPException(status_code=409, detail="Subscription already exists")
+    await db.commit()
     
     return new_sub
 
@@ -90,12 +90,10 @@ async def create_subscription(
 @router.get("/subscriptions/{subscription_id}", response_model=SubscriptionResponse)
 async def get_subscription(
     subscription_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get subscription by ID"""
-    subscription = db.query(Subscription).filter(
-        Subscription.id == subscription_id
-    ).first()
+    subscription = await db.get(Subscription, subscription_id)
     
     if not subscription:
         raise HTTPException(status_code=404, detail="Subscription not found")
@@ -107,12 +105,10 @@ async def get_subscription(
 async def update_subscription(
     subscription_id: str,
     update: SubscriptionUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Update subscription"""
-    subscription = db.query(Subscription).filter(
-        Subscription.id == subscription_id
-    ).first()
+    subscription = await db.get(Subscription, subscription_id)
     
     if not subscription:
         raise HTTPException(status_code=404, detail="Subscription not found")
@@ -128,8 +124,8 @@ async def update_subscription(
     if update.period_days is not None:
         subscription.period_days = update.period_days
     
-    db.commit()
-    db.refresh(subscription)
+    await db.commit()
+    await db.refresh(subscription)
     
     return subscription
 
@@ -137,20 +133,18 @@ async def update_subscription(
 @router.delete("/subscriptions/{subscription_id}")
 async def delete_subscription(
     subscription_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Delete subscription and associated media"""
-    subscription = db.query(Subscription).filter(
-        Subscription.id == subscription_id
-    ).first()
+    subscription = await db.get(Subscription, subscription_id)
     
     if not subscription:
         raise HTTPException(status_code=404, detail="Subscription not found")
     
     # Delete associated media items if desired
     # For now, just delete the subscription
-    db.delete(subscription)
-    db.commit()
+    await db.delete(subscription)
+    await db.commit()
     
     return {"status": "deleted"}
 
@@ -158,15 +152,13 @@ async def delete_subscription(
 @router.post("/subscriptions/{subscription_id}/sync")
 async def manual_sync_subscription(
     subscription_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Manually trigger sync for a subscription"""
     from backend.workers.tasks import process_media_task, process_subscription_task
     from backend.db.models import ProcessingJob
     
-    subscription = db.query(Subscription).filter(
-        Subscription.id == subscription_id
-    ).first()
+    subscription = await db.get(Subscription, subscription_id)
     
     if not subscription:
         raise HTTPException(status_code=404, detail="Subscription not found")
@@ -176,8 +168,8 @@ async def manual_sync_subscription(
     
     try:
         task = process_subscription_task.delay(subscription_id)
-        subscription.last_checked = datetime.utcnow()
-        db.commit()
+        subscription.last_checked = func.now()
+        await db.commit()
         
         return {
             "status": "queued",
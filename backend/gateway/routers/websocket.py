@@ -5,9 +5,11 @@ from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 from typing import Dict, Set
 import json
 import asyncio
+import orjson
 
-from backend.db.database import get_db
+from backend.db.database import AsyncSessionLocal
 from backend.db.models import ProcessingJob
+from backend.services.job_events import JOB_CHANNEL_PREFIX, get_progress, job_status_payload
 
 router = APIRouter()
 
@@ -33,27 +35,35 @@ class ConnectionManager:
         self.active_connections[job_id].add(websocket)
     
     async def broadcast_to_job(self, job_id: str, message: dict):
-        if job_id in self.active_connections:
-            disconnected = set()
-            for connection in self.active_connections[job_id]:
-                try:
-                    await connection.send_json(message)
-                except Exception:
-                    disconnected.add(connection)
-            
-            # Clean up disconnected clients
-            for connection in disconnected:
-                self.active_connections[job_id].discard(connection)
+        await self.broadcast_text(job_id, orjson.dumps(message).decode())
+    
+    async def broadcast_text(self, job_id: str, payload: str):
+        """Send an already-serialized JSON message to every subscriber concurrently"""
+        connections = list(self.active_connections.get(job_id, ()))
+        if not connections:
+            return
+        results = await asyncio.gather(
+            *(connection.send_text(payload) for connection in connections),
+            return_exceptions=True
+        )
+        
+        # Clean up disconnected clients
+        for connection, result in zip(connections, results):
+            if isinstance(result, Exception):
+                self.disconnect(connection, job_id)
 
 
 manager = ConnectionManager()
 
 
-async def get_job_status(job_id: str) -> dict:
-    """Fetch current job status from database"""
-    db = next(get_db())
-    try:
-        job = db.query(ProcessingJob).filter(ProcessingJob.id == job_id).first()
+async def get_job_status(job_id: str, redis=None) -> dict:
+    """Current job status: in-flight progress from Redis, else the database row"""
+    if redis is not None:
+        progress = await get_progress(redis, job_id)
+        if progress is not None:
+            return progress
+    async with AsyncSessionLocal() as db:
+        job = await db.get(ProcessingJob, job_id)
         if not job:
             return {
                 "job_id": job_id,
@@ -61,16 +71,29 @@ async def get_job_status(job_id: str) -> dict:
                 "error": "Job not found"
             }
         
-        return {
-            "job_id": job.id,
-            "status": job.status,
-            "progress": job.progress,
-            "stage": job.current_stage,
-            "error": job.error_message,
-            "result": job.result
-        }
-    finally:
-        db.close()
+        return job_status_payload(job)
+
+
+async def relay_job_events(redis):
+    """
+    Forward job status events published by the workers to subscribed sockets.
+    One pattern subscription per gateway process; started from the app lifespan
+    """
+    while True:
+        try:
+            async with redis.pubsub() as pubsub:
+                await pubsub.psubscribe(f"{JOB_CHANNEL_PREFIX}*")
+                async for message in pubsub.listen():
+                    if message["type"] != "pmessage":
+                        continue
+                    job_id = message["channel"].decode()[len(JOB_CHANNEL_PREFIX):]
+                    # Workers publish the final JSON payload; relay it as-is
+                    await manager.broadcast_text(job_id, message["data"].decode())
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"⚠️  Job event relay disconnected: {e}")
+            await asyncio.sleep(1)
 
 
 @router.websocket("/ws")
@@ -98,52 +121,21 @@ async def websocket_endpoint(websocket: WebSocket):
                 manager.subscribe(job_id, websocket)
                 subscribed_jobs.add(job_id)
                 
-                # Send initial status
-                status = await get_job_status(job_id)
+                # Send initial status; later changes arrive via relay_job_events
+                status = await get_job_status(job_id, websocket.app.state.redis)
                 await websocket.send_json(status)
-                
-                # Start polling for updates (in production, use Celery events)
-                asyncio.create_task(poll_job_status(job_id, websocket))
             
             elif action == "unsubscribe" and job_id:
                 manager.disconnect(websocket, job_id)
                 subscribed_jobs.discard(job_id)
     
     except WebSocketDisconnect:
-        # Clean up all subscriptions
+        pass
+    finally:
+        # Clean up all subscriptions, whatever ended the connection
         for job_id in subscribed_jobs:
             manager.disconnect(websocket, job_id)
 
 
-async def poll_job_status(job_id: str, websocket: WebSocket):
-    """
-    Poll job status and send updates
-    In production, replace with Celery event listeners
-    """
-    last_status = None
-    max_checks = 300  # 5 minutes with 1s interval
-    checks = 0
-    
-    while checks < max_checks:
-        try:
-            status = await get_job_status(job_id)
-            
-            # Send update if status changed
-            if status != last_status:
-                await manager.broadcast_to_job(job_id, status)
-                last_status = status
-            
-            # Stop polling if job is completed or failed
-            if status.get("status") in ["completed", "failed"]:
-                break
-            
-            await asyncio.sleep(1)
-            checks += 1
-        
-        except Exception as e:
-            print(f"Error polling job {job_id}: {e}")
-            break
-
-
 # Export manager for use in workers
 __all__ = ["router", "manager"]
@@ -1,21 +1,80 @@
 """
-Audio deduplication using chromaprint fingerprinting
+Audio deduplication: content hash (default) or chromaprint fingerprint
 """
 import base64
-import acoustid
+import hashlib
+import os
+import tempfile
+from typing import BinaryIO, Iterable, Union
 from backend.config.settings import settings
 
 
+def _content_digest():
+    """BLAKE2b-256: the digest stored in media_items.audio_hash (keep it stable)"""
+    return hashlib.blake2b(digest_size=32)
+
+
 class AudioDeduplicator:
-    """Generate audio fingerprints for deduplication"""
+    """Generate audio hashes for deduplication"""
     
-    def generate_hash(self, audio_path: str) -> str:
+    def generate_hash(self, audio: Union[str, BinaryIO, Iterable[bytes]]) -> str:
         """
-        Generate chromaprint fingerprint hash
+        Hash an audio file for the duplicate check (fits media_items.audio_hash)
+        
+        Accepts a path, a binary file-like object (e.g. the in-memory buffer
+        from MinIOClient.stream_object) or an iterable of byte chunks (e.g.
+        MinIOClient.iter_object, hashed as it downloads).
+        
+        AUDIO_DEDUP_MODE "content": streaming BLAKE2b of the file bytes, exact
+        duplicates only, I/O bound. "chromaprint": fpcalc fingerprint prefix,
+        decodes the whole file.
         
         Returns:
-            str: Hex-encoded fingerprint hash
+            str: 64-character hash
         """
+        if settings.AUDIO_DEDUP_MODE == "chromaprint":
+            if isinstance(audio, str):
+                return self._fingerprint(audio)
+            return self._fingerprint_stream(audio)
+        try:
+            # Files go through hashlib.file_digest: a C readinto loop into
+            # one reused buffer (BytesIO is hashed straight from its buffer)
+            if isinstance(audio, str):
+                with open(audio, 'rb') as f:
+                    return hashlib.file_digest(f, _content_digest).hexdigest()
+            if hasattr(audio, 'read'):
+                digest = hashlib.file_digest(audio, _content_digest)
+                audio.seek(0)
+                return digest.hexdigest()
+            digest = _content_digest()
+            self._update_digest(digest, audio)
+            return digest.hexdigest()
+        except OSError as e:
+            raise Exception(f"Failed to hash audio file: {str(e)}")
+    
+    @staticmethod
+    def _update_digest(digest, chunks: Iterable[bytes]):
+        for chunk in chunks:
+            digest.update(chunk)
+    
+    def _fingerprint_stream(self, audio: Union[BinaryIO, Iterable[bytes]]) -> str:
+        """fpcalc only reads files: spill the buffer or chunks to a temp file first"""
+        fd, path = tempfile.mkstemp(dir=settings.TEMP_DIR)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                if hasattr(audio, 'read'):
+                    f.write(audio.read())
+                    audio.seek(0)
+                else:
+                    for chunk in audio:
+                        f.write(chunk)
+            return self._fingerprint(path)
+        finally:
+            os.remove(path)
+    
+    def _fingerprint(self, audio_path: str) -> str:
+        """Chromaprint fingerprint, truncated to the column size"""
+        import acoustid
         try:
             # Generate fingerprint using acoustid
             duration, fingerprint = acoustid.fingerprint_file(audio_path)
@@ -36,6 +95,6 @@ class AudioDeduplicator:
         """
         Compare two audio hashes for similarity
         
-        For chromaprint, exact match is sufficient for duplicates
+        Both modes produce exact-match hashes
         """
         return hash1 == hash2
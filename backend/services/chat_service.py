@@ -3,54 +3,68 @@ Chat service — RAG (Retrieval-Augmented Generation) with the full archive.
 Supports all content types: notes, audio, video, web pages, YouTube, etc.
 Uses Gemini if GEMINI_API_KEY is set, otherwise falls back to OpenAI.
 """
+from functools import lru_cache
 from typing import List, Tuple
-from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy import Integer, bindparam, text
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.services.embeddings import generate_embedding
+from backend.services.embeddings import generate_embedding_async
 from backend.config.settings import settings
 
+# Characters of raw_text per context item; Postgres sends only this prefix
+CONTEXT_SNIPPET_CHARS = 600
+
+# Built once at import (asyncpg caches the prepared statement per connection).
+# WHERE must keep matching EMBEDDING_INDEX_PREDICATE (db/database.py) for the ANN index
+CONTEXT_SEARCH_STMT = text("""
+    SELECT
+        id,
+        title,
+        type,
+        ai_summary,
+        LEFT(raw_text, :snippet_chars) AS raw_snippet,
+        tags,
+        -(embedding <#> CAST(:embedding AS halfvec)) AS similarity
+    FROM media_items
+    WHERE
+        embedding IS NOT NULL
+        AND status = 'completed'
+    ORDER BY embedding <#> CAST(:embedding AS halfvec)
+    LIMIT :limit
+""").bindparams(
+    bindparam("embedding"),
+    bindparam("limit", type_=Integer),
+    bindparam("snippet_chars", type_=Integer),
+)
+
 
 async def answer_with_context(
     query: str,
-    db: Session,
+    db: AsyncSession,
     max_context_items: int = 5,
 ) -> Tuple[str, List[str]]:
     """
     Answer a user question using the most relevant archive items as context.
     Returns: (response_text, context_media_ids)
     """
-    query_embedding = generate_embedding(query)
-    embedding_str = "[" + ",".join(map(str, query_embedding)) + "]"
-
-    search_sql = text("""
-        SELECT
-            id,
-            title,
-            type,
-            ai_summary,
-            raw_text,
-            tags,
-            1 - (embedding <=> CAST(:embedding AS vector)) AS similarity
-        FROM media_items
-        WHERE
-            embedding IS NOT NULL
-            AND status = 'completed'
-        ORDER BY embedding <=> CAST(:embedding AS vector)
-        LIMIT :limit
-    """)
-
-    rows = db.execute(
-        search_sql,
-        {"embedding": embedding_str, "limit": max_context_items},
-    ).fetchall()
+    query_embedding = await generate_embedding_async(query)
+
+    result = await db.execute(
+        CONTEXT_SEARCH_STMT,
+        {
+            "embedding": query_embedding,
+            "limit": max_context_items,
+            "snippet_chars": CONTEXT_SNIPPET_CHARS,
+        },
+    )
+    rows = result.fetchall()
 
     context_parts: List[str] = []
     context_ids: List[str] = []
 
     for row in rows:
         context_ids.append(str(row.id))
-        content_snippet = (row.raw_text or '')[:600]
+        content_snippet = _trim_to_word(row.raw_snippet or '', CONTEXT_SNIPPET_CHARS)
         tags_str = ', '.join(row.tags) if row.tags else ''
         context_parts.append(
             f"[{row.type.upper()}] {row.title}\n"
@@ -72,37 +86,45 @@ Answer the question using the provided context. If the context doesn't contain e
     return response, context_ids
 
 
-async def _call_llm(prompt: str) -> str:
-    """Call LLM: Gemini if key available, otherwise OpenAI (async-safe)."""
-    import asyncio
+def _trim_to_word(snippet: str, limit: int) -> str:
+    """Drop a trailing partial word from a LEFT()-truncated snippet."""
+    if len(snippet) < limit:
+        return snippet
+    cut = snippet.rfind(' ')
+    return snippet[:cut] if cut > 0 else snippet
+
+
+@lru_cache(maxsize=1)
+def _get_openai_client():
+    """Fallback async OpenAI client, shared so its connection pool stays warm."""
+    from openai import AsyncOpenAI
+    client_kwargs = {
+        "api_key": settings.OPENAI_API_KEY,
+        "timeout": 60.0,
+    }
+    if settings.OPENAI_BASE_URL:
+        client_kwargs["base_url"] = settings.OPENAI_BASE_URL
+    return AsyncOpenAI(**client_kwargs)
+
 
+async def _call_llm(prompt: str) -> str:
+    """Call LLM: Gemini if key available, otherwise OpenAI (non-blocking)."""
     if settings.GEMINI_API_KEY:
         try:
-            from backend.services.gemini_service import GeminiService
-            gemini = GeminiService()
-            return await asyncio.to_thread(gemini.answer_question, "", prompt)
+            from backend.services.gemini_service import get_gemini_service
+            gemini = get_gemini_service()
+            return await gemini.answer_question_async("", prompt)
         except Exception as e:
             print(f"Gemini failed, falling back to OpenAI: {e}")
 
-    # OpenAI fallback (run sync client in thread pool)
-    def _openai_call():
-        from openai import OpenAI
-        client_kwargs = {
-            "api_key": settings.OPENAI_API_KEY,
-            "timeout": 60.0,
-        }
-        if settings.OPENAI_BASE_URL:
-            client_kwargs["base_url"] = settings.OPENAI_BASE_URL
-        client = OpenAI(**client_kwargs)
-        resp = client.chat.completions.create(
+    # OpenAI fallback
+    try:
+        resp = await _get_openai_client().chat.completions.create(
             model="gpt-4.1-mini",
             messages=[{"role": "user", "content": prompt}],
             max_tokens=1000,
             temperature=0.7,
         )
         return resp.choices[0].message.content or "No response generated."
-
-    try:
-        return await asyncio.to_thread(_openai_call)
     except Exception as e:
         return f"Error generating response: {e}"
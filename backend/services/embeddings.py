@@ -2,14 +2,35 @@
 Embeddings generation for semantic search.
 Uses sentence-transformers all-MiniLM-L6-v2 (384-dim) locally.
 Falls back to hash-based embeddings if model unavailable.
+All vectors are L2-normalized, so search can rank by inner product (<#>).
 """
-from typing import List
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+import asyncio
+import hashlib
 import threading
 
+import numpy as np
+import redis
+
+from backend.config.settings import settings
+from backend.services.redis_client import get_client
+
 _model = None
 _model_lock = threading.Lock()
 EMBEDDING_DIM = 384
 
+# Query-time micro-batching: concurrent requests share one model.encode call
+EMBED_BATCH_SIZE = 32
+EMBED_BATCH_WAIT = 0.005  # seconds to wait for more texts before encoding
+
+# LRU of query embeddings, keyed on the normalized query text (gateway process)
+QUERY_CACHE_SIZE = 8192
+_query_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+
+# Redis cache of document embeddings by content hash (workers; float32 bytes)
+EMBEDDING_CACHE_PREFIX = "embedding:all-MiniLM-L6-v2:"
+
 
 def _get_model():
     """Lazy-load the sentence-transformers model (thread-safe)."""
@@ -17,16 +38,43 @@ def _get_model():
     if _model is None:
         with _model_lock:
             if _model is None:
-                try:
-                    from sentence_transformers import SentenceTransformer
-                    _model = SentenceTransformer('all-MiniLM-L6-v2')
-                    print("Loaded sentence-transformers model: all-MiniLM-L6-v2")
-                except Exception as e:
-                    print(f"Failed to load sentence-transformers model: {e}")
-                    _model = None
+                _model = _load_model()
     return _model
 
 
+def _load_model():
+    """
+    The int8-quantized ONNX export shipped in the model repo when
+    EMBEDDING_BACKEND is "onnx" (same vectors, several times faster on CPU),
+    otherwise or if that fails, the PyTorch weights.
+    """
+    try:
+        from sentence_transformers import SentenceTransformer
+    except Exception as e:
+        print(f"Failed to load sentence-transformers model: {e}")
+        return None
+
+    if settings.EMBEDDING_BACKEND == "onnx":
+        try:
+            model = SentenceTransformer(
+                'all-MiniLM-L6-v2',
+                backend='onnx',
+                model_kwargs={'file_name': settings.EMBEDDING_ONNX_FILE},
+            )
+            print(f"Loaded sentence-transformers model: all-MiniLM-L6-v2 ({settings.EMBEDDING_ONNX_FILE})")
+            return model
+        except Exception as e:
+            print(f"ONNX embedding model unavailable ({e}), falling back to PyTorch")
+
+    try:
+        model = SentenceTransformer('all-MiniLM-L6-v2')
+        print("Loaded sentence-transformers model: all-MiniLM-L6-v2")
+        return model
+    except Exception as e:
+        print(f"Failed to load sentence-transformers model: {e}")
+        return None
+
+
 def generate_embedding(text: str) -> List[float]:
     """Generate a 384-dim embedding for a single text."""
     model = _get_model()
@@ -42,19 +90,143 @@ def generate_embedding(text: str) -> List[float]:
 
 def generate_embeddings_batch(texts: List[str]) -> List[List[float]]:
     """Generate 384-dim embeddings for a batch of texts."""
+    embeddings, _ = _encode_batch(texts)
+    return [e.tolist() for e in embeddings]
+
+
+def _embedding_cache_key(text: str) -> str:
+    digest = hashlib.blake2b(text[:8000].encode(), digest_size=16).hexdigest()
+    return f"{EMBEDDING_CACHE_PREFIX}{digest}"
+
+
+def generate_embeddings_cached(texts: List[str]) -> List[List[float]]:
+    """
+    generate_embeddings_batch through a Redis cache keyed on the text's hash:
+    texts seen before (e.g. feed items on every re-sync) skip the model.
+    Only the misses are encoded, in one batch. Redis errors act as misses.
+    """
+    if not texts:
+        return []
+    keys = [_embedding_cache_key(t) for t in texts]
+    cached: List[Optional[bytes]] = [None] * len(texts)
+    if settings.EMBEDDING_CACHE_TTL > 0:
+        try:
+            cached = get_client().mget(keys)
+        except redis.RedisError as e:
+            print(f"⚠️  Embedding cache read failed: {e}")
+
+    misses = [i for i, raw in enumerate(cached) if raw is None]
+    embeddings: List[Optional[np.ndarray]] = [
+        np.frombuffer(raw, dtype=np.float32) if raw is not None else None for raw in cached
+    ]
+    if misses:
+        fresh, from_model = _encode_batch([texts[i] for i in misses])
+        fresh = fresh.astype(np.float32, copy=False)
+        for i, emb in zip(misses, fresh):
+            embeddings[i] = emb
+        # Hash fallbacks (model unavailable or failed) are not worth keeping
+        if settings.EMBEDDING_CACHE_TTL > 0 and from_model:
+            try:
+                pipe = get_client().pipeline(transaction=False)
+                for i, emb in zip(misses, fresh):
+                    pipe.set(keys[i], emb.tobytes(), ex=settings.EMBEDDING_CACHE_TTL)
+                pipe.execute()
+            except redis.RedisError as e:
+                print(f"⚠️  Embedding cache write failed: {e}")
+    return [e.tolist() for e in embeddings]
+
+
+def _encode_batch(texts: List[str]) -> Tuple[np.ndarray, bool]:
+    """
+    (len(texts), 384) float32 array of normalized embeddings; never raises.
+    The flag is False when the hash fallback was used instead of the model.
+    """
     model = _get_model()
     if model is None:
-        return [_fallback_embedding(t) for t in texts]
+        return _fallback_batch(texts), False
     try:
-        embs = model.encode([t[:8000] for t in texts], normalize_embeddings=True)
-        return [e.tolist() for e in embs]
+        return model.encode(
+            [t[:8000] for t in texts],
+            batch_size=EMBED_BATCH_SIZE,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+        ), True
     except Exception as e:
         print(f"Batch embedding failed: {e}, using fallback")
-        return [_fallback_embedding(t) for t in texts]
+        return _fallback_batch(texts), False
+
+
+def _fallback_batch(texts: List[str]) -> np.ndarray:
+    return np.array([_fallback_embedding(t) for t in texts], dtype=np.float32)
+
+
+class _EmbeddingBatcher:
+    """Coalesce concurrent query embeddings from the event loop into batched encode calls."""
+
+    def __init__(self):
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    async def submit(self, text: str) -> Tuple[np.ndarray, bool]:
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + EMBED_BATCH_WAIT
+            while len(batch) < EMBED_BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            # Encode off the event loop; _encode_batch never raises
+            embs, from_model = await asyncio.to_thread(_encode_batch, [t for t, _ in batch])
+            for (_, future), emb in zip(batch, embs):
+                if not future.done():  # Caller may have been cancelled
+                    future.set_result((emb, from_model))
+
+
+_batcher = _EmbeddingBatcher()
+
+
+async def generate_embedding_async(text: str) -> np.ndarray:
+    """
+    Async generate_embedding for request handlers, batched with concurrent callers.
+    Returns a float32 array: bind it directly, asyncpg sends it to pgvector in binary.
+    
+    Repeated queries are served from an in-process LRU. Case and whitespace are
+    normalized first; the MiniLM tokenizer is uncased, so the vector is the same.
+    """
+    key = ' '.join(text.split()).lower()
+    cached = _query_cache.get(key)
+    if cached is not None:
+        _query_cache.move_to_end(key)
+        return cached
+
+    embedding, from_model = await _batcher.submit(key)
+    embedding.setflags(write=False)  # Shared between requests
+    # A hash fallback would outlive the model coming back; don't keep it
+    if from_model:
+        _query_cache[key] = embedding
+        if len(_query_cache) > QUERY_CACHE_SIZE:
+            _query_cache.popitem(last=False)
+    return embedding
 
 
 def _fallback_embedding(text: str) -> List[float]:
-    """Hash-based deterministic fallback embedding (384-dim)."""
+    """Hash-based deterministic fallback embedding (384-dim, unit-length)."""
     import hashlib, math
     h = hashlib.sha256(text.encode()).digest()
-    return [math.sin(h[i % 32] * (i + 1) * 0.01) for i in range(EMBEDDING_DIM)]
+    vec = [math.sin(h[i % 32] * (i + 1) * 0.01) for i in range(EMBEDDING_DIM)]
+    norm = math.sqrt(sum(v * v for v in vec)) or 1.0
+    return [v / norm for v in vec]
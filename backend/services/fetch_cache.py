@@ -0,0 +1,55 @@
+"""
+Redis cache for fetched feeds and pages, keyed on the URL.
+
+Each entry keeps the response validators (ETag / Last-Modified) next to the
+extracted result, so the next sync can send a conditional request and reuse
+the result on 304 Not Modified instead of downloading and parsing again.
+Best-effort like llm_cache: any Redis failure behaves like a miss.
+"""
+import hashlib
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+import redis
+
+from backend.config.settings import settings
+from backend.services.redis_client import get_client
+
+
+def _key(kind: str, url: str) -> str:
+    return f"fetch:{kind}:{hashlib.sha256(url.encode()).hexdigest()}"
+
+
+def lookup(kind: str, url: str) -> Optional[Dict[str, Any]]:
+    """{'etag', 'modified', 'result'} from the last fetch of url, or None"""
+    if settings.FETCH_CACHE_TTL <= 0:
+        return None
+    try:
+        raw = get_client().get(_key(kind, url))
+    except redis.RedisError as e:
+        print(f"⚠️  Fetch cache read failed: {e}")
+        return None
+    return json.loads(raw) if raw is not None else None
+
+
+def lookup_many(keys: List[Tuple[str, str]]) -> List[Optional[Dict[str, Any]]]:
+    """lookup for several (kind, url) pairs in one round-trip"""
+    if settings.FETCH_CACHE_TTL <= 0 or not keys:
+        return [None] * len(keys)
+    try:
+        raws = get_client().mget([_key(kind, url) for kind, url in keys])
+    except redis.RedisError as e:
+        print(f"⚠️  Fetch cache read failed: {e}")
+        return [None] * len(keys)
+    return [json.loads(raw) if raw is not None else None for raw in raws]
+
+
+def store(kind: str, url: str, etag: Optional[str], modified: Optional[str], result: Any) -> None:
+    """Remember result with its validators; nothing to revalidate without them"""
+    if settings.FETCH_CACHE_TTL <= 0 or not (etag or modified):
+        return
+    entry = {'etag': etag, 'modified': modified, 'result': result}
+    try:
+        get_client().set(_key(kind, url), json.dumps(entry), ex=settings.FETCH_CACHE_TTL)
+    except redis.RedisError as e:
+        print(f"⚠️  Fetch cache write failed: {e}")
@@ -4,37 +4,115 @@ AI enrichment service (summary, tags) — backed by OpenAI-compatible API.
 The class is intentionally named GeminiService to keep all existing call-sites
 unchanged; internally it uses the OpenAI SDK pointed at the configured base URL.
 """
+from functools import lru_cache
 from typing import Dict, List, Optional
 import json
 import os
-from openai import OpenAI
-from tenacity import retry, stop_after_attempt, wait_exponential
+import openai
+from openai import AsyncOpenAI, OpenAI
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
 from backend.config.settings import settings
+from backend.services import llm_cache
+
+# Retry only what a retry can fix (network, 429, 5xx), not bad requests or parsing
+llm_retry = retry(
+    retry=retry_if_exception_type(
+        (openai.APIConnectionError, openai.RateLimitError, openai.InternalServerError)
+    ),
+    stop=stop_after_attempt(3),
+    wait=wait_exponential(multiplier=2, min=2, max=10),
+)
+
+# Structured output for enrich_transcript: the API guarantees this JSON shape
+ENRICHMENT_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "enrichment",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "aiSummary": {"type": "string"},
+                "tags": {"type": "array", "items": {"type": "string"}},
+            },
+            "required": ["aiSummary", "tags"],
+            "additionalProperties": False,
+        },
+    },
+}
+JSON_OBJECT_RESPONSE_FORMAT = {"type": "json_object"}
+# Not every OpenAI-compatible endpoint (Gemini's compat layer, local servers)
+# takes json_schema/strict or even json_object: on a 400 step down this list;
+# the prompts themselves ask for JSON, so None still works
+JSON_RESPONSE_FORMATS = [ENRICHMENT_RESPONSE_FORMAT, JSON_OBJECT_RESPONSE_FORMAT, None]
+
+
+def _loads_json(raw: str):
+    """json.loads, tolerating the ```json fence models add without a response_format"""
+    raw = raw.strip()
+    if raw.startswith("```"):
+        raw = raw.strip("`").removeprefix("json").strip()
+    return json.loads(raw)
 
 
 class GeminiService:
     """AI enrichment service using OpenAI-compatible API."""
 
     def __init__(self):
-        self.client = OpenAI(
+        client_kwargs = dict(
             api_key=settings.OPENAI_API_KEY,
             base_url=getattr(settings, "OPENAI_BASE_URL", None) or os.environ.get("OPENAI_BASE_URL"),
         )
+        self.client = OpenAI(**client_kwargs)
+        # For request handlers on the event loop (no thread per in-flight call)
+        self.aclient = AsyncOpenAI(**client_kwargs)
         self.model = getattr(settings, "OPENAI_MODEL", None) or "gpt-4.1-mini"
+        # response_format types this endpoint rejected (skipped from then on)
+        self._unsupported_formats: set = set()
 
-    def _chat(self, prompt: str, json_mode: bool = False) -> str:
+    def _chat_kwargs(self, prompt: str, response_format: Optional[dict] = None) -> dict:
         kwargs: dict = dict(
             model=self.model,
             messages=[{"role": "user", "content": prompt}],
             temperature=0.3,
         )
-        if json_mode:
-            kwargs["response_format"] = {"type": "json_object"}
-        response = self.client.chat.completions.create(**kwargs)
+        if response_format:
+            kwargs["response_format"] = response_format
+        return kwargs
+
+    def _chat(self, prompt: str, response_format: Optional[dict] = None) -> str:
+        response = self.client.chat.completions.create(**self._chat_kwargs(prompt, response_format))
         return response.choices[0].message.content or ""
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=2, min=2, max=10))
+    def _chat_json(self, prompt: str, response_format: dict) -> str:
+        """
+        _chat with the strongest JSON mode the endpoint accepts, starting at
+        response_format and stepping down JSON_RESPONSE_FORMATS on a 400
+        """
+        candidates = JSON_RESPONSE_FORMATS[JSON_RESPONSE_FORMATS.index(response_format):]
+        for fmt in candidates:
+            if fmt is not None and fmt["type"] in self._unsupported_formats:
+                continue
+            try:
+                return self._chat(prompt, response_format=fmt)
+            except openai.BadRequestError as e:
+                if fmt is None:
+                    raise
+                if any(word in str(e) for word in ("response_format", "json_schema", "json_object", "strict")):
+                    self._unsupported_formats.add(fmt["type"])
+                print(f"⚠️  LLM endpoint rejected response_format {fmt['type']}, retrying without it: {e}")
+
+    async def _achat(self, prompt: str, response_format: Optional[dict] = None) -> str:
+        response = await self.aclient.chat.completions.create(**self._chat_kwargs(prompt, response_format))
+        return response.choices[0].message.content or ""
+
+    @llm_retry
     def enrich_transcript(self, text: str) -> Dict[str, object]:
+        cache_key = llm_cache.make_key("enrich", self.model, text[:8000])
+        cached = llm_cache.lookup(cache_key)
+        if cached is not None:
+            return cached
+
         prompt = f"""ANALYZE THE FOLLOWING TEXT:
 \"\"\"{text[:8000]}\"\"\"
 
@@ -48,19 +126,50 @@ RETURN ONLY JSON:
     "tags": ["tag1", "tag2", "tag3"]
 }}
 """
-        raw = self._chat(prompt, json_mode=True)
+        raw = self._chat_json(prompt, ENRICHMENT_RESPONSE_FORMAT)
         try:
-            result = json.loads(raw)
-        except json.JSONDecodeError:
-            result = {}
-        return {
-            "ai_summary": result.get("aiSummary", ""),
-            "tags": result.get("tags", []),
+            result = _loads_json(raw)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Enrichment response is not valid JSON: {raw[:200]!r}") from e
+        # Without a strict schema the model may answer an array, a scalar or no summary
+        summary = result.get("aiSummary") if isinstance(result, dict) else None
+        if not isinstance(summary, str) or not summary.strip():
+            raise ValueError(f"Enrichment response has no aiSummary: {raw[:200]!r}")
+        tags = result.get("tags")
+        enrichment = {
+            "ai_summary": summary,
+            "tags": [str(tag) for tag in tags] if isinstance(tags, list) else [],
         }
+        llm_cache.store(cache_key, enrichment)
+        return enrichment
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=2, min=2, max=10))
+    @llm_retry
     def answer_question(self, question: str, context: str) -> str:
-        prompt = f"""CONTEXT FROM ARCHIVE:
+        cache_key = llm_cache.make_key("answer", self.model, question, context)
+        cached = llm_cache.lookup(cache_key)
+        if cached is not None:
+            return cached
+
+        answer = self._chat(self._answer_prompt(question, context))
+        if answer:
+            llm_cache.store(cache_key, answer)
+        return answer
+
+    @llm_retry
+    async def answer_question_async(self, question: str, context: str) -> str:
+        cache_key = llm_cache.make_key("answer", self.model, question, context)
+        cached = await llm_cache.alookup(cache_key)
+        if cached is not None:
+            return cached
+
+        answer = await self._achat(self._answer_prompt(question, context))
+        if answer:
+            await llm_cache.astore(cache_key, answer)
+        return answer
+
+    @staticmethod
+    def _answer_prompt(question: str, context: str) -> str:
+        return f"""CONTEXT FROM ARCHIVE:
 {context}
 
 USER QUESTION: {question}
@@ -68,9 +177,8 @@ USER QUESTION: {question}
 Answer the question using the provided context. If the context does not contain
 enough information, use your knowledge but mention the limitation.
 """
-        return self._chat(prompt)
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=2, min=2, max=10))
+    @llm_retry
     def extract_feed_items(
         self,
         source_title: str,
@@ -80,6 +188,13 @@ enough information, use your knowledge but mention the limitation.
     ) -> List[Dict[str, object]]:
         trimmed = content[:20000]
         prompt_text = (prompt or "").strip() or "Extract the most important updates."
+        cache_key = llm_cache.make_key(
+            "feed", self.model, source_title, prompt_text, str(period_days), trimmed
+        )
+        cached = llm_cache.lookup(cache_key)
+        if cached is not None:
+            return cached
+
         extraction_prompt = f"""SOURCE: {source_title}
 USER INTENT: {prompt_text}
 TIME WINDOW: Only include items from the last {period_days} days.
@@ -93,10 +208,20 @@ Extract 3-10 distinct items. Return ONLY JSON:
   ]
 }}
 """
-        raw = self._chat(extraction_prompt, json_mode=True)
+        raw = self._chat_json(extraction_prompt, JSON_OBJECT_RESPONSE_FORMAT)
         try:
-            result = json.loads(raw)
+            result = _loads_json(raw)
         except json.JSONDecodeError:
             return []
         items = result.get("items", [])
-        return items if isinstance(items, list) else []
+        if not isinstance(items, list):
+            return []
+        if items:
+            llm_cache.store(cache_key, items)
+        return items
+
+
+@lru_cache(maxsize=1)
+def get_gemini_service() -> GeminiService:
+    """Process-wide GeminiService: one OpenAI client and its keep-alive connection pool."""
+    return GeminiService()
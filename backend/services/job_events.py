@@ -0,0 +1,125 @@
+"""
+Job status events over Redis pub/sub.
+
+Workers publish every committed ProcessingJob change to `job:<id>`; the
+gateway relays those messages to WebSocket subscribers instead of polling
+the database.
+
+In-flight progress (stage, percent) is UI state, not durable state: workers
+write it to a short-lived Redis hash with set_progress and only commit
+terminal states (completed, duplicate, error) to Postgres. A committed job
+change supersedes the hash, so it is deleted when that change is published;
+a settled one (completed, error) also frees the job's task lock.
+"""
+import json
+from typing import Dict, Optional
+
+import redis
+from sqlalchemy import event
+
+from backend.db.database import SessionLocal
+from backend.db.models import ProcessingJob
+from backend.services import task_locks
+from backend.services.redis_client import get_client
+
+JOB_CHANNEL_PREFIX = "job:"
+PROGRESS_KEY_PREFIX = "job-progress:"
+PROGRESS_TTL = 24 * 3600  # seconds; outlives any pipeline run
+PUBLISH_TIMEOUT = 2  # seconds
+# Committing one of these ends the pipeline run and frees the job lock
+SETTLED_JOB_STATUSES = ('completed', 'error')
+
+
+def job_channel(job_id: str) -> str:
+    return f"{JOB_CHANNEL_PREFIX}{job_id}"
+
+
+def progress_key(job_id: str) -> str:
+    return f"{PROGRESS_KEY_PREFIX}{job_id}"
+
+
+def job_status_payload(job: ProcessingJob) -> dict:
+    """WebSocket message for a job (same shape for the initial status and updates)"""
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "progress": job.progress_percent,
+        "stage": job.current_stage,
+        "error": job.error_message,
+    }
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _collect_job_changes(session, flush_context):
+    # Snapshot now: attributes are expired after commit
+    for obj in list(session.new) + list(session.dirty):
+        if isinstance(obj, ProcessingJob):
+            pending: Dict[str, dict] = session.info.setdefault("job_events", {})
+            pending[obj.id] = job_status_payload(obj)
+            if obj.status in SETTLED_JOB_STATUSES and obj.celery_task_id:
+                # process_media_task locked the job under its task id
+                owners: Dict[str, str] = session.info.setdefault("job_lock_owners", {})
+                owners[obj.id] = obj.celery_task_id
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _publish_job_changes(session):
+    pending = session.info.pop("job_events", None)
+    owners = session.info.pop("job_lock_owners", {})
+    if not pending:
+        return
+    try:
+        pipe = get_client(PUBLISH_TIMEOUT).pipeline(transaction=False)
+        for job_id, payload in pending.items():
+            pipe.delete(progress_key(job_id))
+            if job_id in owners:
+                task_locks.release(task_locks.job_lock_key(job_id), owners[job_id], pipe=pipe)
+            pipe.publish(job_channel(job_id), json.dumps(payload))
+        pipe.execute()
+    except redis.RedisError as e:
+        # Clients still get the state from the initial DB read on (re)subscribe
+        print(f"⚠️  Failed to publish job status: {e}")
+
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _discard_job_changes(session):
+    session.info.pop("job_events", None)
+    session.info.pop("job_lock_owners", None)
+
+
+def set_progress(job_id: str, status: str, stage: str, percent: int) -> None:
+    """Record and publish in-flight progress without a database write"""
+    payload = {
+        "job_id": job_id,
+        "status": status,
+        "progress": percent,
+        "stage": stage,
+        "error": None,
+    }
+    try:
+        pipe = get_client(PUBLISH_TIMEOUT).pipeline(transaction=False)
+        pipe.hset(progress_key(job_id), mapping={
+            "status": status, "stage": stage, "progress": percent,
+        })
+        pipe.expire(progress_key(job_id), PROGRESS_TTL)
+        pipe.publish(job_channel(job_id), json.dumps(payload))
+        pipe.execute()
+    except redis.RedisError as e:
+        print(f"⚠️  Failed to record job progress: {e}")
+
+
+async def get_progress(redis_client, job_id: str) -> Optional[dict]:
+    """In-flight progress from Redis (gateway, async client); None once the job is settled"""
+    try:
+        fields = await redis_client.hgetall(progress_key(job_id))
+    except redis.RedisError:
+        return None
+    if not fields:
+        return None
+    return {
+        "job_id": job_id,
+        "status": fields[b"status"].decode(),
+        "progress": int(fields[b"progress"]),
+        "stage": fields[b"stage"].decode(),
+        "error": None,
+    }
@@ -0,0 +1,79 @@
+"""
+Redis cache for LLM responses (chat answers, transcript enrichment).
+
+Keys are a SHA-256 of the model name plus the normalized prompt inputs, so a
+repeated question over the same retrieved context skips the LLM round-trip.
+The cache is best-effort: any Redis failure behaves like a miss.
+"""
+import hashlib
+import json
+from typing import Any, Optional
+
+import redis
+import redis.asyncio as aioredis
+
+from backend.config.settings import settings
+from backend.services.redis_client import get_client
+
+_async_client: Optional[aioredis.Redis] = None
+
+
+def _get_async_client() -> aioredis.Redis:
+    """Lazy client for the gateway event loop."""
+    global _async_client
+    if _async_client is None:
+        _async_client = aioredis.Redis.from_url(
+            settings.REDIS_URL,
+            socket_timeout=0.5,
+            socket_connect_timeout=0.5,
+        )
+    return _async_client
+
+
+def make_key(kind: str, *parts: str) -> str:
+    """Cache key for one LLM call; whitespace and case differences are ignored."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(' '.join(part.split()).lower().encode())
+        digest.update(b'\x00')
+    return f"llm:{kind}:{digest.hexdigest()}"
+
+
+def lookup(key: str) -> Optional[Any]:
+    if settings.LLM_CACHE_TTL <= 0:
+        return None
+    try:
+        raw = get_client().get(key)
+    except redis.RedisError as e:
+        print(f"⚠️  LLM cache read failed: {e}")
+        return None
+    return json.loads(raw) if raw is not None else None
+
+
+def store(key: str, value: Any) -> None:
+    if settings.LLM_CACHE_TTL <= 0:
+        return
+    try:
+        get_client().set(key, json.dumps(value), ex=settings.LLM_CACHE_TTL)
+    except redis.RedisError as e:
+        print(f"⚠️  LLM cache write failed: {e}")
+
+
+async def alookup(key: str) -> Optional[Any]:
+    if settings.LLM_CACHE_TTL <= 0:
+        return None
+    try:
+        raw = await _get_async_client().get(key)
+    except redis.RedisError as e:
+        print(f"⚠️  LLM cache read failed: {e}")
+        return None
+    return json.loads(raw) if raw is not None else None
+
+
+async def astore(key: str, value: Any) -> None:
+    if settings.LLM_CACHE_TTL <= 0:
+        return
+    try:
+        await _get_async_client().set(key, json.dumps(value), ex=settings.LLM_CACHE_TTL)
+    except redis.RedisError as e:
+        print(f"⚠️  LLM cache write failed: {e}")
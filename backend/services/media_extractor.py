@@ -8,6 +8,16 @@ import yt_dlp
 
 from backend.config.settings import settings
 
+# Extracted audio: 16 kHz mono Opus at 24 kbps (~180 KB/min, vs ~10 MB/min WAV).
+# Whisper resamples to 16 kHz mono anyway; faster-whisper decodes it with PyAV.
+# Stored as .ogg (Ogg Opus): the Whisper API accepts that extension.
+# Always a real re-encode (convert_to_opus): yt-dlp's FFmpegExtractAudio
+# stream-copies a source that is already Opus, dropping bitrate/mono/rate
+AUDIO_ENCODER = 'libopus'
+AUDIO_BITRATE = '24k'
+AUDIO_SAMPLE_RATE = '16000'
+AUDIO_EXTENSION = '.ogg'
+
 
 class MediaExtractor:
     """Extract audio from URLs (YouTube, etc.) using yt-dlp"""
@@ -26,16 +36,12 @@ class MediaExtractor:
                 'duration': int (seconds)
             }
         """
-        output_template = os.path.join(self.temp_dir, '%(id)s.%(ext)s')
+        # '.source' keeps the download apart from the transcoded .ogg
+        output_template = os.path.join(self.temp_dir, '%(id)s.source.%(ext)s')
         
         ydl_opts = {
             'format': 'bestaudio/best',
             'outtmpl': output_template,
-            'postprocessors': [{
-                'key': 'FFmpegExtractAudio',
-                'preferredcodec': 'wav',
-                'preferredquality': '192',
-            }],
             'impersonate': 'chrome',
             'extractor_args': {
                 'generic': ['impersonate'],
@@ -51,8 +57,14 @@ class MediaExtractor:
             info = ydl.extract_info(url, download=True)
             
             # Get downloaded file path
-            video_id = info['id']
-            audio_path = os.path.join(self.temp_dir, f"{video_id}.wav")
+            downloads = info.get('requested_downloads') or [{}]
+            source_path = downloads[0].get('filepath') or ydl.prepare_filename(info)
+            audio_path = os.path.join(self.temp_dir, f"{info['id']}{AUDIO_EXTENSION}")
+            try:
+                self.convert_to_opus(source_path, audio_path)
+            finally:
+                if os.path.exists(source_path):
+                    os.remove(source_path)
             
             return {
                 'audio_path': audio_path,
@@ -81,6 +93,33 @@ class MediaExtractor:
         except Exception:
             return 0
     
+    def convert_to_opus(self, input_path: str, output_path: str):
+        """
+        Re-encode any audio (or video) file to 16 kHz mono Opus at 24 kbps
+        """
+        subprocess.run(
+            [
+                'ffmpeg',
+                '-nostdin',
+                '-i', input_path,
+                '-vn',  # Drop video / cover art
+                # Same input -> same bytes, so content-hash dedup matches:
+                # no random Ogg stream serial, no source tags or encoder string
+                '-map_metadata', '-1',
+                '-fflags', '+bitexact',
+                '-flags:a', '+bitexact',
+                '-c:a', AUDIO_ENCODER,
+                '-b:a', AUDIO_BITRATE,
+                '-vbr', 'constrained',  # Hold the bitrate; unconstrained VBR overshoots on tonal audio
+                '-ac', '1',  # Mono
+                '-ar', AUDIO_SAMPLE_RATE,
+                output_path,
+                '-y'  # Overwrite
+            ],
+            check=True,
+            capture_output=True
+        )
+    
     def convert_to_wav(self, input_path: str, output_path: str):
         """
         Convert any audio format to WAV using ffmpeg
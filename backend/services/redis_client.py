@@ -0,0 +1,34 @@
+"""
+Shared synchronous Redis clients for the caches, job events and task locks.
+
+One lazily built client (and connection pool) per process and timeout,
+instead of one per module.
+"""
+import threading
+from typing import Dict
+
+import redis
+
+from backend.config.settings import settings
+
+# Best-effort callers (caches, locks) give up fast; a slow Redis acts as a miss
+DEFAULT_TIMEOUT = 0.5  # seconds
+
+_clients: Dict[float, redis.Redis] = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(timeout: float = DEFAULT_TIMEOUT) -> redis.Redis:
+    """Lazy, process-wide client with the given socket/connect timeout (thread-safe)."""
+    client = _clients.get(timeout)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(timeout)
+            if client is None:
+                client = redis.Redis.from_url(
+                    settings.REDIS_URL,
+                    socket_timeout=timeout,
+                    socket_connect_timeout=timeout,
+                )
+                _clients[timeout] = client
+    return client
@@ -0,0 +1,70 @@
+"""
+Redis locks that keep a job or subscription from being processed twice at once.
+
+A duplicate dispatch (Celery redelivery, a double click, overlapping syncs)
+finds the key taken and returns instead of repeating the MinIO / Whisper /
+LLM work. Each key expires on its own, so a crashed worker cannot hold it
+forever. Best-effort like the caches: if Redis is down the task runs.
+
+The key holds its owner's token and is only deleted by that owner: a run
+that outlived the TTL must not free the lock a later run has since taken.
+"""
+from typing import Optional
+from uuid import uuid4
+
+import redis
+
+from backend.services.redis_client import get_client
+
+JOB_LOCK_TTL = 6 * 3600  # seconds; longer than the slowest pipeline run
+SUBSCRIPTION_LOCK_TTL = 3600
+
+# Compare-and-delete in one step (a GET then DEL could race the expiry)
+RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+def job_lock_key(job_id: str) -> str:
+    return f"lock:job:{job_id}"
+
+
+def subscription_lock_key(subscription_id: str) -> str:
+    return f"lock:subscription:{subscription_id}"
+
+
+def acquire(key: str, ttl: int, token: Optional[str] = None) -> Optional[str]:
+    """
+    Take the lock (SET NX EX) under token (a fresh one by default)
+
+    Returns:
+        The token to release with, or None if someone else holds the lock
+    """
+    token = token or uuid4().hex
+    try:
+        if get_client().set(key, token, nx=True, ex=ttl):
+            return token
+        return None
+    except redis.RedisError as e:
+        print(f"⚠️  Task lock {key} unavailable, running unguarded: {e}")
+        return token
+
+
+def release(key: str, token: str, pipe: Optional[redis.client.Pipeline] = None) -> None:
+    """
+    Delete the lock if it still holds token
+
+    With pipe, the release is queued on that pipeline and its errors
+    surface from the caller's execute().
+    """
+    script = get_client().register_script(RELEASE_SCRIPT)
+    if pipe is not None:
+        script(keys=[key], args=[token], client=pipe)
+        return
+    try:
+        script(keys=[key], args=[token])
+    except redis.RedisError as e:
+        print(f"⚠️  Failed to release task lock {key}: {e}")
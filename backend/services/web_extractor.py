@@ -14,74 +14,225 @@ Playwright is used when:
 """
 from __future__ import annotations
 
+import asyncio
+import json
 import re
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set, Tuple
 from urllib.parse import urljoin, urlparse
 
 import feedparser
+import httpx
 import trafilatura
 from trafilatura.metadata import extract_metadata
 
+from backend.config.settings import settings
+from backend.services import fetch_cache
+
+try:
+    from selectolax.parser import HTMLParser
+except ImportError:  # Feed discovery falls back to the regex scan
+    HTMLParser = None
+
+# <link rel="alternate" type="application/rss+xml" href="..."> feed discovery
+_FEED_LINK_SELECTOR = (
+    'link[rel~="alternate"][type*="rss"][href], '
+    'link[rel~="alternate"][type*="atom"][href]'
+)
+_LINK_TAG_RE = re.compile(r"<link[^>]+>", re.IGNORECASE)
+_REL_ALT_RE = re.compile(r"rel=[\"']alternate[\"']", re.IGNORECASE)
+_TYPE_FEED_RE = re.compile(r"type=[\"']application/(?:rss|atom)\+xml[\"']", re.IGNORECASE)
+_HREF_RE = re.compile(r"href=[\"']([^\"']+)[\"']", re.IGNORECASE)
+# A downloaded "page" that is really a feed: by Content-Type or by its first tag
+FEED_CONTENT_TYPES = (
+    'application/rss+xml', 'application/atom+xml', 'application/rdf+xml',
+    'application/feed+json', 'application/json', 'application/xml', 'text/xml',
+)
+_FEED_DOCUMENT_RE = re.compile(r"\A\s*(?:<\?xml[^>]*>\s*)?(?:<!--.*?-->\s*)*<(?:rss|feed|rdf:RDF)\b", re.DOTALL)
+
+# trafilatura.extract options: text only, and no readability/jusText fallback
+# pass (it re-parses the page; Playwright covers pages trafilatura can't read)
+EXTRACT_OPTIONS = dict(
+    include_comments=False,
+    include_tables=False,
+    include_formatting=False,
+    include_links=False,
+    no_fallback=True,
+    favor_precision=False,
+)
+
+# Concurrent article fetches for feed entries (FEED_FETCH_ARTICLES)
+FEED_FETCH_CONCURRENCY = 20
+FEED_FETCH_TIMEOUT = 20  # seconds per article
+
 
 class WebExtractor:
     """Extract text content from web pages and RSS/Atom feeds."""
 
     def extract(self, url: str) -> Dict:
+        """
+        {'title', 'text'} plus 'entries' for feeds, and the response's
+        'etag' / 'modified' validators. A result reused after a 304 (see
+        fetch_cache) also has 'not_modified': True
+        """
         if self._is_feed(url):
             return self._extract_feed(url)
         return self._extract_page(url)
 
+    def unchanged(self, validators: Dict[str, Tuple[str, Dict]]) -> Set[str]:
+        """
+        The keys of validators ({key: (url, {'etag', 'modified'})}) whose URL
+        still answers 304, revalidated concurrently with conditional HEADs.
+        URLs that fail to answer count as changed
+        """
+        targets = {
+            key: (url, self._conditional_headers(entry))
+            for key, (url, entry) in validators.items()
+        }
+        if not targets:
+            return set()
+        return asyncio.run(self._revalidate_many(targets))
+
     def _is_feed(self, url: str) -> bool:
         path = urlparse(url).path.lower()
         return path.endswith('.xml') or 'rss' in path or 'feed' in path
 
-    def _extract_feed(self, url: str) -> Dict:
-        feed = feedparser.parse(url)
+    @staticmethod
+    def _feed_cache_kind() -> str:
+        return 'feed-articles' if settings.FEED_FETCH_ARTICLES else 'feed'
+
+    def _extract_feed(self, url: str, data: Optional[str] = None) -> Dict:
+        """Parse the feed at url, or the already-downloaded document in data (no HTTP)"""
+        cache_kind = self._feed_cache_kind()
+        cached = None
+        if data is not None:
+            feed = self._parse_json_feed(data) if data.lstrip().startswith('{') else feedparser.parse(data)
+        else:
+            # Conditional GET: an unchanged feed (304) reuses the last result
+            cached = fetch_cache.lookup(cache_kind, url)
+            feed = feedparser.parse(
+                url,
+                etag=cached['etag'] if cached else None,
+                modified=cached['modified'] if cached else None,
+            )
+            if cached and feed.get('status') == 304:
+                return self._reuse(cached)
+
         entries = feed.entries[:20]
         title = feed.feed.get('title') or url
 
-        parts: List[str] = []
-        structured_entries: List[Dict] = []
-
-        for entry in entries:
-            entry_title = entry.get('title') or ''
-            entry_summary = entry.get('summary') or entry.get('description') or ''
-            entry_link = entry.get('link') or ''
-            entry_date = entry.get('published') or entry.get('updated') or ''
-            parts.append(f"{entry_title}\n{entry_summary}".strip())
-            structured_entries.append({
-                'title': entry_title,
-                'summary': entry_summary,
-                'url': entry_link,
-                'date': entry_date,
-            })
-
-        text = "\n\n".join([p for p in parts if p])
+        # Full article bodies instead of the feed's summaries: fetched concurrently
+        bodies: List[Optional[str]] = [None] * len(entries)
+        if settings.FEED_FETCH_ARTICLES:
+            bodies = self._fetch_article_texts([entry.get('link') or '' for entry in entries])
+
+        structured_entries: List[Dict] = [
+            {
+                'title': entry.get('title') or '',
+                'summary': entry.get('summary') or entry.get('description') or '',
+                'url': entry.get('link') or '',
+                'date': entry.get('published') or entry.get('updated') or '',
+            }
+            for entry in entries
+        ]
+
+        text = "\n\n".join(
+            part for part in (
+                "\n".join(filter(None, (item['title'], body or item['summary']))).strip()
+                for item, body in zip(structured_entries, bodies)
+            ) if part
+        )
         if not text:
             raise ValueError("Feed has no readable entries")
 
-        return {'title': title, 'text': text, 'entries': structured_entries}
+        result = {'title': title, 'text': text, 'entries': structured_entries}
+        fetch_cache.store(cache_kind, url, feed.get('etag'), feed.get('modified'), result)
+        return {**result, 'etag': feed.get('etag'), 'modified': feed.get('modified')}
+
+    def _parse_json_feed(self, data: str) -> feedparser.FeedParserDict:
+        """JSON Feed (jsonfeed.org) in the shape feedparser returns for RSS/Atom"""
+        doc = json.loads(data)
+        items = doc.get('items') if isinstance(doc, dict) else None
+        if not isinstance(items, list):
+            raise ValueError("Not a JSON Feed")
+        entries = [
+            {
+                'title': item.get('title'),
+                'summary': item.get('summary') or item.get('content_text'),
+                'link': item.get('url') or item.get('external_url'),
+                'published': item.get('date_published'),
+                'updated': item.get('date_modified'),
+            }
+            for item in items if isinstance(item, dict)
+        ]
+        return feedparser.FeedParserDict(feed={'title': doc.get('title')}, entries=entries)
+
+    def _fetch_article_texts(self, urls: List[str]) -> List[Optional[str]]:
+        """Fetch the URLs concurrently and extract each page's text (None on failure)"""
+        pages = asyncio.run(self._fetch_many(urls))
+        return [
+            trafilatura.extract(html, **EXTRACT_OPTIONS) if html else None
+            for html in pages
+        ]
+
+    async def _fetch_many(self, urls: List[str]) -> List[Optional[str]]:
+        """GET every URL on one pooled client, at most FEED_FETCH_CONCURRENCY at a time"""
+        semaphore = asyncio.Semaphore(FEED_FETCH_CONCURRENCY)
+
+        async def fetch(client: httpx.AsyncClient, url: str) -> Optional[str]:
+            if not url:
+                return None
+            async with semaphore:
+                try:
+                    response = await client.get(url)
+                    response.raise_for_status()
+                    return response.text
+                except httpx.HTTPError:
+                    return None
+
+        async with httpx.AsyncClient(follow_redirects=True, timeout=FEED_FETCH_TIMEOUT) as client:
+            return await asyncio.gather(*(fetch(client, url) for url in urls))
 
     def _extract_page(self, url: str) -> Dict:
+        # 0. Unchanged since the last extraction: skip download, parsing and Playwright
+        cached = fetch_cache.lookup('page', url)
+        if cached and self._not_modified(url, cached):
+            return self._reuse(cached)
+
         # 1. Try trafilatura (fast, no JS)
         downloaded: Optional[str] = None
         extracted: Optional[str] = None
+        headers: Dict[str, str] = {}
 
         try:
-            downloaded = trafilatura.fetch_url(url)
+            response = trafilatura.fetch_response(url, decode=True, with_headers=True)
+            if response is not None and response.status == 200:
+                downloaded = response.html
+                headers = {k.lower(): v for k, v in (response.headers or {}).items()}
         except Exception:
             pass
 
+        # Callers revalidate url itself, whichever document the text came from
+        validators = {'etag': headers.get('etag'), 'modified': headers.get('last-modified')}
+
+        # Payloads that don't need trafilatura's HTML pruning
+        content_type = headers.get('content-type', '').split(';')[0].strip().lower()
+        if downloaded and (content_type in FEED_CONTENT_TYPES or _FEED_DOCUMENT_RE.match(downloaded)):
+            # The URL serves a feed itself: parse what we have instead of fetching it again
+            try:
+                return {**self._extract_feed(url, data=downloaded), **validators}
+            except Exception:
+                pass
+        if downloaded and content_type == 'text/plain' and downloaded.strip():
+            return {'title': url, 'text': downloaded.strip(), **validators}
+
         if downloaded:
             feed_url = self._discover_feed_url(downloaded, url)
             if feed_url:
                 try:
-                    return self._extract_feed(feed_url)
+                    return {**self._extract_feed(feed_url), **validators}
                 except Exception:
                     pass
-            extracted = trafilatura.extract(
-                downloaded, include_comments=False, include_tables=False
-            )
+            extracted = trafilatura.extract(downloaded, **EXTRACT_OPTIONS)
 
         # 2. Fall back to Playwright if trafilatura yielded nothing useful
         if not extracted or len(extracted) < 200:
@@ -92,13 +243,71 @@ class WebExtractor:
         if not extracted:
             raise ValueError("Failed to extract readable text from URL")
 
-        title = url
-        if downloaded:
-            metadata = extract_metadata(downloaded)
-            if metadata and metadata.title:
-                title = metadata.title
+        title = (self._page_title(downloaded) if downloaded else None) or url
+
+        result = {'title': title, 'text': extracted}
+        fetch_cache.store('page', url, validators['etag'], validators['modified'], result)
+        return {**result, **validators}
+
+    def _page_title(self, html: str) -> Optional[str]:
+        """og:title or <title> via selectolax; trafilatura's metadata extraction otherwise"""
+        if HTMLParser is not None:
+            tree = HTMLParser(html)
+            node = tree.css_first('meta[property="og:title"][content]')
+            title = node.attributes.get('content') if node is not None else None
+            if not title:
+                node = tree.css_first('title')
+                title = node.text(strip=True) if node is not None else None
+            if title:
+                return title.strip()
+        metadata = extract_metadata(html)
+        return metadata.title if metadata and metadata.title else None
 
-        return {'title': title, 'text': extracted}
+    @staticmethod
+    def _reuse(cached: Dict) -> Dict:
+        return {
+            **cached['result'],
+            'etag': cached['etag'],
+            'modified': cached['modified'],
+            'not_modified': True,
+        }
+
+    @staticmethod
+    def _conditional_headers(cached: Dict) -> Dict[str, str]:
+        conditional = {}
+        if cached.get('etag'):
+            conditional['If-None-Match'] = cached['etag']
+        if cached.get('modified'):
+            conditional['If-Modified-Since'] = cached['modified']
+        return conditional
+
+    def _not_modified(self, url: str, cached: Dict) -> bool:
+        """Conditional HEAD with the cached validators; True on 304"""
+        try:
+            response = httpx.head(
+                url, headers=self._conditional_headers(cached), follow_redirects=True, timeout=10
+            )
+        except httpx.HTTPError:
+            return False
+        return response.status_code == 304
+
+    async def _revalidate_many(self, targets: Dict[str, Tuple[str, Dict[str, str]]]) -> Set[str]:
+        """_not_modified for every (url, headers) on one pooled client, at most FEED_FETCH_CONCURRENCY at a time"""
+        semaphore = asyncio.Semaphore(FEED_FETCH_CONCURRENCY)
+
+        async def revalidate(client: httpx.AsyncClient, url: str, headers: Dict[str, str]) -> bool:
+            async with semaphore:
+                try:
+                    response = await client.head(url, headers=headers)
+                except httpx.HTTPError:
+                    return False
+                return response.status_code == 304
+
+        async with httpx.AsyncClient(follow_redirects=True, timeout=10) as client:
+            results = await asyncio.gather(
+                *(revalidate(client, url, headers) for url, headers in targets.values())
+            )
+        return {key for key, not_modified in zip(targets, results) if not_modified}
 
     def _extract_with_playwright(self, url: str) -> Optional[str]:
         """
@@ -146,21 +355,23 @@ class WebExtractor:
         if not html:
             return None
 
-        extracted = trafilatura.extract(html, include_comments=False, include_tables=False)
+        extracted = trafilatura.extract(html, **EXTRACT_OPTIONS)
         return extracted
 
     def _discover_feed_url(self, html: str, base_url: str) -> Optional[str]:
         if not html:
             return None
-        link_tags = re.findall(r"<link[^>]+>", html, flags=re.IGNORECASE)
-        for tag in link_tags:
-            if not re.search(r"rel=[\"']alternate[\"']", tag, flags=re.IGNORECASE):
+        if HTMLParser is not None:
+            node = HTMLParser(html).css_first(_FEED_LINK_SELECTOR)
+            if node is None:
+                return None
+            return urljoin(base_url, node.attributes.get('href') or '')
+        for tag in _LINK_TAG_RE.findall(html):
+            if not _REL_ALT_RE.search(tag):
                 continue
-            if not re.search(
-                r"type=[\"']application/(rss|atom)\+xml[\"']", tag, flags=re.IGNORECASE
-            ):
+            if not _TYPE_FEED_RE.search(tag):
                 continue
-            href_match = re.search(r"href=[\"']([^\"']+)[\"']", tag, flags=re.IGNORECASE)
+            href_match = _HREF_RE.search(tag)
             if not href_match:
                 continue
             return urljoin(base_url, href_match.group(1))
@@ -1,7 +1,7 @@
 """
 Whisper STT service - supports both local (faster-whisper) and API mode
 """
-from typing import Dict, List
+from typing import BinaryIO, Dict, List, Union
 from backend.config.settings import settings
 
 
@@ -13,19 +13,25 @@ class WhisperService:
         self.model_name = settings.WHISPER_MODEL
         
         if self.mode == 'local':
-            from faster_whisper import WhisperModel
+            from faster_whisper import BatchedInferencePipeline, WhisperModel
+            device = settings.WHISPER_DEVICE
             self.model = WhisperModel(
                 self.model_name,
-                device="cpu",  # or "cuda" for GPU
-                compute_type="int8"
+                device=device,
+                # INT8 weights: int8 GEMMs on CPU, int8 + fp16 activations on GPU
+                compute_type="int8" if device == "cpu" else "int8_float16"
             )
+            self.beam_size = settings.WHISPER_BEAM_SIZE
+            # VAD-chunked batched decoding; WHISPER_BATCH_SIZE=0 keeps sequential decoding
+            self.batch_size = settings.WHISPER_BATCH_SIZE
+            self.batched = BatchedInferencePipeline(model=self.model) if self.batch_size > 0 else None
         elif self.mode == 'api':
             from openai import OpenAI
             self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
     
-    def transcribe(self, audio_path: str) -> Dict[str, any]:
+    def transcribe(self, audio: Union[str, BinaryIO]) -> Dict[str, any]:
         """
-        Transcribe audio file
+        Transcribe an audio file path or binary file-like object
         
         Returns:
             dict: {
@@ -34,19 +40,33 @@ class WhisperService:
             }
         """
         if self.mode == 'local':
-            return self._transcribe_local(audio_path)
+            return self._transcribe_local(audio)
         elif self.mode == 'api':
-            return self._transcribe_api(audio_path)
+            return self._transcribe_api(audio)
         else:
             raise ValueError(f"Invalid whisper mode: {self.mode}")
     
-    def _transcribe_local(self, audio_path: str) -> Dict[str, any]:
-        """Transcribe using faster-whisper (local)"""
-        segments, info = self.model.transcribe(
-            audio_path,
-            language="ru",  # or None for auto-detect
-            beam_size=5
-        )
+    def _transcribe_local(self, audio: Union[str, BinaryIO]) -> Dict[str, any]:
+        """Transcribe using faster-whisper (local); PyAV decodes paths and buffers alike"""
+        if self.batched is not None:
+            segments, info = self.batched.transcribe(
+                audio,
+                language="ru",  # or None for auto-detect
+                beam_size=self.beam_size,
+                best_of=1,
+                condition_on_previous_text=False,
+                vad_filter=True,
+                batch_size=self.batch_size
+            )
+        else:
+            segments, info = self.model.transcribe(
+                audio,
+                language="ru",  # or None for auto-detect
+                beam_size=self.beam_size,
+                best_of=1,
+                condition_on_previous_text=False,
+                vad_filter=True
+            )
         
         # Collect segments
         full_text = []
@@ -66,15 +86,14 @@ class WhisperService:
             'turns': turns
         }
     
-    def _transcribe_api(self, audio_path: str) -> Dict[str, any]:
+    def _transcribe_api(self, audio: Union[str, BinaryIO]) -> Dict[str, any]:
         """Transcribe using OpenAI Whisper API"""
-        with open(audio_path, 'rb') as audio_file:
-            response = self.client.audio.transcriptions.create(
-                model="whisper-1",
-                file=audio_file,
-                response_format="verbose_json",
-                timestamp_granularities=["segment"]
-            )
+        if isinstance(audio, str):
+            with open(audio, 'rb') as audio_file:
+                response = self._create_transcription(audio_file)
+        else:
+            # Named buffer: the API infers the format from the file name
+            response = self._create_transcription(audio)
         
         # Extract segments
         turns = []
@@ -96,3 +115,11 @@ class WhisperService:
                 'end_time': 0
             }]
         }
+    
+    def _create_transcription(self, audio_file: BinaryIO):
+        return self.client.audio.transcriptions.create(
+            model="whisper-1",
+            file=audio_file,
+            response_format="verbose_json",
+            timestamp_granularities=["segment"]
+        )
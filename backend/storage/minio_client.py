@@ -1,21 +1,64 @@
 """
 MinIO client for object storage
 """
+import io
 import os
+import socket
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, Iterator, Optional
+import certifi
+import urllib3
+from urllib3.connection import HTTPConnection
+from urllib3.util import Retry, Timeout
 from minio import Minio
 from minio.error import S3Error
 from backend.config.settings import settings
 
+# Multipart chunk size for streamed uploads (bounds memory per upload)
+UPLOAD_PART_SIZE = 8 * 1024 * 1024
+# File uploads: large parts sent over several connections at once
+FILE_UPLOAD_PART_SIZE = 64 * 1024 * 1024
+FILE_UPLOAD_PARALLEL_PARTS = 4
+# Downloads: objects this large are fetched as concurrent byte ranges
+PARALLEL_DOWNLOAD_CHUNKS = 8
+PARALLEL_DOWNLOAD_MIN_SIZE = 16 * 1024 * 1024
+DOWNLOAD_READ_SIZE = 1 << 20
+
+AUDIO_CONTENT_TYPES = {
+    '.wav': 'audio/wav',
+    '.m4a': 'audio/mp4',
+    '.mp3': 'audio/mpeg',
+    '.ogg': 'audio/ogg',
+    '.opus': 'audio/ogg',
+    '.webm': 'audio/webm',
+}
+
 
 class MinIOClient:
     """MinIO/S3 client for storing media files"""
     
     def __init__(self):
+        # Keep-alive connection pool shared by every call (and thread) on this
+        # client; one client per process (gateway app.state, worker get_minio)
+        http_client = urllib3.PoolManager(
+            num_pools=20,
+            maxsize=32,
+            block=False,  # Burst past maxsize instead of waiting; extras aren't kept
+            timeout=Timeout(connect=2, read=30),  # read: per socket read, not per object
+            retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[500, 502, 503, 504]),
+            # TCP keepalive so idle pooled connections aren't silently dropped
+            socket_options=HTTPConnection.default_socket_options + [
+                (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            ],
+            cert_reqs='CERT_REQUIRED',
+            ca_certs=certifi.where()
+        )
         self.client = Minio(
             settings.MINIO_ENDPOINT,
             access_key=settings.MINIO_ACCESS_KEY,
             secret_key=settings.MINIO_SECRET_KEY,
-            secure=settings.MINIO_SECURE
+            secure=settings.MINIO_SECURE,
+            http_client=http_client
         )
         self.bucket = settings.MINIO_BUCKET
         self._ensure_bucket()
@@ -31,52 +74,180 @@ class MinIOClient:
     
     def upload_audio(self, file_path: str, media_id: str) -> str:
         """
-        Upload audio file to MinIO
+        Upload audio file to MinIO (parallel multipart for large files)
         
         Returns:
-            str: MinIO object path (audio/{media_id}.wav)
+            str: MinIO object path (audio/{media_id}{file extension})
         """
-        object_name = f"audio/{media_id}.wav"
+        extension = os.path.splitext(file_path)[1].lower() or '.wav'
+        object_name = f"audio/{media_id}{extension}"
         
         try:
             self.client.fput_object(
                 self.bucket,
                 object_name,
                 file_path,
-                content_type='audio/wav'
+                content_type=AUDIO_CONTENT_TYPES.get(extension, 'application/octet-stream'),
+                part_size=FILE_UPLOAD_PART_SIZE,
+                num_parallel_uploads=FILE_UPLOAD_PARALLEL_PARTS
             )
             return object_name
         except S3Error as e:
-            raise Exception(f"Failed to upload to MinIO: {str(e)}")
+            raise Exception(f"Failed to upload to MinIO: {str(e)}") from e
     
-    def download_audio(self, object_name: str) -> str:
+    def upload_audio_stream(
+        self,
+        data: BinaryIO,
+        media_id: str,
+        length: int = -1,
+        extension: str = '.wav',
+        content_type: str = 'audio/wav',
+    ) -> str:
         """
-        Download audio file from MinIO to temp directory
+        Stream a file-like object to MinIO without staging it on disk
+        
+        Unknown length (-1) is sent as a multipart upload, so memory stays
+        bounded by one part regardless of file size.
         
         Returns:
-            str: Local file path
+            str: MinIO object path (audio/{media_id}{extension})
         """
-        local_path = os.path.join(
-            settings.TEMP_DIR,
-            os.path.basename(object_name)
-        )
+        object_name = f"audio/{media_id}{extension}"
         
         try:
-            self.client.fget_object(
+            self.client.put_object(
                 self.bucket,
                 object_name,
-                local_path
+                data,
+                length=length,
+                part_size=UPLOAD_PART_SIZE,
+                content_type=content_type
+            )
+            return object_name
+        except S3Error as e:
+            raise Exception(f"Failed to upload to MinIO: {str(e)}") from e
+    
+    def download_audio(self, object_name: str, local_path: Optional[str] = None) -> str:
+        """
+        Download audio file from MinIO (to the temp directory by default)
+        
+        Returns:
+            str: Local file path
+        """
+        if local_path is None:
+            local_path = os.path.join(
+                settings.TEMP_DIR,
+                os.path.basename(object_name)
             )
-            return local_path
+        return self.download_audio_parallel(object_name, local_path)
+    
+    def download_audio_parallel(
+        self,
+        object_name: str,
+        out_path: str,
+        chunks: int = PARALLEL_DOWNLOAD_CHUNKS,
+    ) -> str:
+        """
+        Download an object as `chunks` concurrent byte-range GETs
+        
+        Each range is written at its own offset of a preallocated file, so a
+        large object uses several connections' worth of bandwidth. Objects
+        under PARALLEL_DOWNLOAD_MIN_SIZE take a single GET.
+        
+        Returns:
+            str: out_path
+        """
+        try:
+            return self._download_ranges(object_name, out_path, chunks)
+        except BaseException as e:
+            # Never leave a partial (zero-filled, full-size) file at out_path:
+            # it is the pipeline's hand-off path and is used if it exists
+            if os.path.exists(out_path):
+                os.unlink(out_path)
+            if isinstance(e, S3Error):
+                raise Exception(f"Failed to download from MinIO: {str(e)}") from e
+            raise
+    
+    def _download_ranges(self, object_name: str, out_path: str, chunks: int) -> str:
+        """download_audio_parallel without the cleanup and error wrapping"""
+        size = self.client.stat_object(self.bucket, object_name).size
+        if chunks <= 1 or size < PARALLEL_DOWNLOAD_MIN_SIZE:
+            self.client.fget_object(self.bucket, object_name, out_path)
+            return out_path
+        
+        range_size = -(-size // chunks)  # ceil
+        fd = os.open(out_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            if hasattr(os, 'posix_fallocate'):
+                os.posix_fallocate(fd, 0, size)
+            else:
+                os.ftruncate(fd, size)
+            
+            def fetch_range(offset: int):
+                end = offset + min(range_size, size - offset)
+                response = self.client.get_object(
+                    self.bucket, object_name,
+                    offset=offset, length=end - offset
+                )
+                try:
+                    for chunk in response.stream(DOWNLOAD_READ_SIZE):
+                        os.pwrite(fd, chunk, offset)
+                        offset += len(chunk)
+                finally:
+                    response.close()
+                    response.release_conn()
+                if offset != end:
+                    # A short body would leave a zero-filled gap in the file
+                    raise IOError(f"Incomplete range from MinIO: {object_name} ended at byte {offset} of {end}")
+            
+            with ThreadPoolExecutor(max_workers=chunks) as pool:
+                # list() re-raises the first failed range
+                list(pool.map(fetch_range, range(0, size, range_size)))
+        finally:
+            os.close(fd)
+        return out_path
+    
+    def iter_object(self, object_name: str, chunk_size: int = 1 << 20) -> Iterator[bytes]:
+        """
+        Yield an object's bytes in chunks straight off the HTTP response
+        
+        Memory stays bounded by one chunk; the connection goes back to the
+        pool when the generator is exhausted or closed.
+        """
+        response = None
+        try:
+            response = self.client.get_object(self.bucket, object_name)
+            yield from response.stream(chunk_size)
         except S3Error as e:
-            raise Exception(f"Failed to download from MinIO: {str(e)}")
+            raise Exception(f"Failed to download from MinIO: {str(e)}") from e
+        finally:
+            if response is not None:
+                response.close()
+                response.release_conn()
+    
+    def stream_object(self, object_name: str) -> io.BytesIO:
+        """
+        Read an object straight into memory (no temp file on disk)
+        
+        The buffer's name is the object's basename, so consumers that sniff
+        the format from a file name (Whisper API upload) still work.
+        
+        Returns:
+            io.BytesIO: Object bytes, positioned at the start
+        """
+        buffer = io.BytesIO()
+        for chunk in self.iter_object(object_name, UPLOAD_PART_SIZE):
+            buffer.write(chunk)
+        buffer.seek(0)
+        buffer.name = os.path.basename(object_name)
+        return buffer
     
     def delete_audio(self, object_name: str):
         """Delete audio file from MinIO"""
         try:
             self.client.remove_object(self.bucket, object_name)
         except S3Error as e:
-            raise Exception(f"Failed to delete from MinIO: {str(e)}")
+            raise Exception(f"Failed to delete from MinIO: {str(e)}") from e
     
     def get_presigned_url(self, object_name: str, expires_seconds: int = 3600) -> str:
         """
@@ -90,4 +261,4 @@ class MinIOClient:
             )
             return url
         except S3Error as e:
-            raise Exception(f"Failed to generate presigned URL: {str(e)}")
+            raise Exception(f"Failed to generate presigned URL: {str(e)}") from e
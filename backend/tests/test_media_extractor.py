@@ -0,0 +1,83 @@
+"""
+MediaExtractor audio transcode: the stored file must really be 16 kHz mono
+24 kbps Opus, whatever the source codec (including a source that is
+already Opus, which yt-dlp's FFmpegExtractAudio would only stream-copy)
+"""
+import json
+import shutil
+import subprocess
+
+import pytest
+
+from backend.services.audio_dedup import AudioDeduplicator
+from backend.services.media_extractor import MediaExtractor
+
+pytestmark = pytest.mark.skipif(
+    not (shutil.which('ffmpeg') and shutil.which('ffprobe')),
+    reason="ffmpeg/ffprobe not installed",
+)
+
+
+def _make_source(path, codec_args):
+    """Twenty seconds of a 48 kHz stereo tone, encoded with codec_args"""
+    subprocess.run(
+        [
+            'ffmpeg', '-nostdin', '-v', 'error',
+            '-f', 'lavfi', '-i', 'sine=frequency=440:sample_rate=48000:duration=20',
+            '-ac', '2', *codec_args, str(path), '-y',
+        ],
+        check=True,
+    )
+
+
+def _probe(path):
+    result = subprocess.run(
+        [
+            'ffprobe', '-v', 'error',
+            '-show_entries', 'stream=codec_name,channels:format=bit_rate',
+            '-of', 'json', str(path),
+        ],
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout)
+
+
+def _opus_input_rate(path):
+    """OpusHead input sample rate (ffprobe always reports Opus at 48 kHz)"""
+    data = path.read_bytes()
+    head = data.index(b'OpusHead')
+    return int.from_bytes(data[head + 12:head + 16], 'little')
+
+
+@pytest.mark.parametrize('suffix, codec_args', [
+    ('.webm', ['-c:a', 'libopus', '-b:a', '128k']),  # Already Opus: YouTube's usual bestaudio
+    ('.m4a', ['-c:a', 'aac', '-b:a', '128k']),
+    ('.wav', ['-c:a', 'pcm_s16le']),
+])
+def test_convert_to_opus_reencodes_every_source(tmp_path, suffix, codec_args):
+    source = tmp_path / f"source{suffix}"
+    output = tmp_path / "audio.ogg"
+    _make_source(source, codec_args)
+
+    MediaExtractor().convert_to_opus(str(source), str(output))
+
+    probe = _probe(output)
+    (stream,) = probe['streams']
+    assert stream['codec_name'] == 'opus'
+    assert stream['channels'] == 1
+    assert _opus_input_rate(output) == 16000
+    # 24 kbps target plus Ogg page overhead (a 128k+ source would be far above)
+    assert int(probe['format']['bit_rate']) < 32_000
+
+
+def test_convert_to_opus_is_deterministic(tmp_path):
+    """Content-hash dedup compares the encoded bytes: re-extracting must match"""
+    source = tmp_path / "source.webm"
+    _make_source(source, ['-c:a', 'libopus', '-b:a', '128k'])
+
+    digests = set()
+    for run in range(2):
+        output = tmp_path / f"audio-{run}.ogg"
+        MediaExtractor().convert_to_opus(str(source), str(output))
+        digests.add(AudioDeduplicator().generate_hash(str(output)))
+    assert len(digests) == 1
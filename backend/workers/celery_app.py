@@ -19,10 +19,15 @@ app.conf.update(
     result_serializer='json',
     timezone='UTC',
     enable_utc=True,
-    task_track_started=True,
+    # Job state lives in Postgres / Redis progress (job_events) and chains pass
+    # results in the next message: nothing reads the result backend, so
+    # don't serialize and store every step's return value there
+    task_ignore_result=True,
     task_time_limit=3600,  # 1 hour max per task
     task_soft_time_limit=3300,  # 55 minutes soft limit
-    worker_prefetch_multiplier=1,  # Process one task at a time
+    # Default for CPU-bound workers (Whisper): one task at a time. I/O workers
+    # override it on the command line (--prefetch-multiplier), see task_routes
+    worker_prefetch_multiplier=1,
     worker_max_tasks_per_child=50,  # Restart worker after 50 tasks (memory cleanup)
 )
 
@@ -33,9 +38,14 @@ app.conf.beat_schedule = {
     }
 }
 
-# Task routes (optional: split tasks across different queues)
+# Task routes: CPU-bound and I/O-bound work run on separately sized workers
+#   transcription                      CPU/GPU (Whisper): -c 1 --prefetch-multiplier=1
+#   celery, extraction, web_extraction,
+#   enrichment                         I/O (downloads, MinIO, LLM API): -c 8 --prefetch-multiplier=4
+# (docker-compose.yml: `worker` and `worker-io`)
 app.conf.task_routes = {
     'backend.workers.tasks.extract_media': {'queue': 'extraction'},
+    'backend.workers.tasks.extract_web_content': {'queue': 'web_extraction'},
     'backend.workers.tasks.transcribe_audio': {'queue': 'transcription'},
     'backend.workers.tasks.enrich_with_gemini': {'queue': 'enrichment'},
 }
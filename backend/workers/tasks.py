@@ -1,12 +1,18 @@
 """
 Celery tasks for media processing pipeline
 """
+import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, Optional
 import re
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from email.utils import parsedate_to_datetime
+from functools import lru_cache
 from celery import chain
+from celery.signals import worker_process_init
+from sqlalchemy import bindparam, func, insert, or_, select, update
+from sqlalchemy.orm import defer
 from backend.workers.celery_app import app
 from backend.db.database import get_db_context
 from backend.db.models import MediaItem, ProcessingJob, Subscription
@@ -14,23 +20,101 @@ from backend.services.media_extractor import MediaExtractor
 from backend.services.web_extractor import WebExtractor
 from backend.services.audio_dedup import AudioDeduplicator
 from backend.services.whisper_service import WhisperService
-from backend.services.gemini_service import GeminiService
-from backend.services.embeddings import generate_embedding
+from backend.services.gemini_service import get_gemini_service
+from backend.services.embeddings import generate_embedding, generate_embeddings_cached
+from backend.services.job_events import SETTLED_JOB_STATUSES, set_progress  # also publishes ProcessingJob changes to Redis
+from backend.services import fetch_cache, task_locks
 from backend.storage.minio_client import MinIOClient
+from backend.config.settings import settings
 from uuid import uuid4
 
+# Per worker process: built once and reused by every task (WhisperService
+# loads its model from disk, MinIOClient holds the HTTP connection pool)
+_whisper: Optional[WhisperService] = None
+_minio: Optional[MinIOClient] = None
+# Stateless helpers: plain module-level instances
+_web_extractor = WebExtractor()
+_media_extractor = MediaExtractor()
+_deduplicator = AudioDeduplicator()
+
+
+def get_whisper() -> WhisperService:
+    global _whisper
+    if _whisper is None:
+        _whisper = WhisperService()
+    return _whisper
+
+
+def get_minio() -> MinIOClient:
+    global _minio
+    if _minio is None:
+        _minio = MinIOClient()
+    return _minio
+
+
+@worker_process_init.connect
+def preload_clients(**kwargs):
+    """Warm the shared clients in each forked worker so the first task doesn't pay for them"""
+    try:
+        get_minio()
+        if settings.WHISPER_MODE == 'local':
+            get_whisper()
+    except Exception as e:
+        print(f"⚠️  Worker preload failed, clients will load on first use: {e}")
+
+
+# Statements every pipeline run repeats, built once with bind parameters
+# (their compiled SQL is then served from the engine's compiled cache)
+_SELECT_JOB_MEDIA_WITH_TEXT = select(ProcessingJob, MediaItem).join(
+    MediaItem, MediaItem.id == ProcessingJob.media_id
+).where(
+    ProcessingJob.id == bindparam('job_id')
+).options(defer(MediaItem.transcript), defer(MediaItem.embedding))
+_SELECT_JOB_MEDIA = _SELECT_JOB_MEDIA_WITH_TEXT.options(defer(MediaItem.raw_text))
+_SELECT_JOB = select(ProcessingJob).where(ProcessingJob.id == bindparam('job_id'))
+_SELECT_SOURCE_TYPE = select(MediaItem.source_type, ProcessingJob.status).join(
+    ProcessingJob, ProcessingJob.media_id == MediaItem.id
+).where(ProcessingJob.id == bindparam('job_id'))
+_SELECT_DUPLICATE = select(MediaItem.id, MediaItem.minio_path).where(
+    MediaItem.audio_hash == bindparam('audio_hash'),
+    MediaItem.id != bindparam('media_id'),
+    MediaItem.status == 'completed'
+).limit(1)
+
+
+def _load_job_and_media(db, job_id: str, with_text: bool = False):
+    """
+    A job and its media item in one round-trip
+    
+    The large payload columns are deferred: tasks only ever write them,
+    except enrichment, which reads raw_text (with_text=True)
+    """
+    stmt = _SELECT_JOB_MEDIA_WITH_TEXT if with_text else _SELECT_JOB_MEDIA
+    return db.execute(stmt, {'job_id': job_id}).one()
+
 
 @app.task(bind=True, name='backend.workers.tasks.process_media_task')
 def process_media_task(self, job_id: str):
     """
     Main orchestrator task - chains all processing steps
+    
+    Idempotent per job: a redelivered or repeated dispatch finds the job
+    lock taken (released when the job settles) or the job already settled.
+    The lock token is this task's id, which the gateway records as
+    job.celery_task_id, so whichever task settles the job can release it
     """
+    lock_key = task_locks.job_lock_key(job_id)
+    lock_token = task_locks.acquire(lock_key, task_locks.JOB_LOCK_TTL, token=self.request.id)
+    if lock_token is None:
+        return {'status': 'already_running', 'job_id': job_id}
+
     with get_db_context() as db:
-        job = db.query(ProcessingJob).filter(ProcessingJob.id == job_id).first()
-        media = db.query(MediaItem).filter(MediaItem.id == job.media_id).first()
-        
-        # Get source_type before session closes
-        source_type = media.source_type
+        # Only the source type (and whether the job is still open) is needed
+        source_type, job_status = db.execute(_SELECT_SOURCE_TYPE, {'job_id': job_id}).one()
+
+    if job_status in SETTLED_JOB_STATUSES:
+        task_locks.release(lock_key, lock_token)
+        return {'status': 'skipped', 'job_id': job_id, 'reason': f'job already {job_status}'}
 
     # Now safe to use source_type after context closes
     if source_type in ['web_url', 'rss_url']:
@@ -57,26 +141,21 @@ def extract_web_content(self, job_id: str):
     Extract text from web page or feed
     """
     with get_db_context() as db:
-        job = db.query(ProcessingJob).filter(ProcessingJob.id == job_id).first()
-        media = db.query(MediaItem).filter(MediaItem.id == job.media_id).first()
+        job, media = _load_job_and_media(db, job_id)
 
-        job.status = 'extracting'
-        job.current_stage = 'Web Extraction'
-        job.progress_percent = 10
-        db.commit()
+        set_progress(job_id, 'extracting', 'Web Extraction', 10)
 
         try:
-            extractor = WebExtractor()
+            extractor = _web_extractor
             result = extractor.extract(media.source_url)
 
             media.title = result.get('title') or media.title
             media.raw_text = result.get('text')
-            job.progress_percent = 40
-            db.commit()
+            set_progress(job_id, 'extracting', 'Web Extraction', 40)
 
-            return {
-                'raw_text': media.raw_text,
-            }
+            # The text is committed with this task; the next step reads it
+            # from the row, not through the result backend
+            return {'media_id': media.id}
         except Exception as e:
             job.status = 'error'
             job.error_message = f"Web extraction failed: {str(e)}"
@@ -90,69 +169,63 @@ def extract_media(self, job_id: str):
     """
     Step 1: Extract/Download media and upload to MinIO
     
-    Returns: dict with minio_path, duration, title
+    The audio is hashed here, while it is on local disk anyway, and kept in
+    TEMP_DIR for the rest of the pipeline: check_duplicate only queries the
+    database and transcribe_audio reads the same file.
+    
+    Returns: dict with minio_path, duration, title, audio_hash, local_path
     """
+    local_path = None
     with get_db_context() as db:
-        job = db.query(ProcessingJob).filter(ProcessingJob.id == job_id).first()
-        media = db.query(MediaItem).filter(MediaItem.id == job.media_id).first()
+        job, media = _load_job_and_media(db, job_id)
         
         # Update status
-        job.status = 'extracting'
-        job.current_stage = 'Media Extraction'
-        job.progress_percent = 10
-        db.commit()
+        set_progress(job_id, 'extracting', 'Media Extraction', 10)
         
         try:
-            extractor = MediaExtractor()
-            minio_client = MinIOClient()
+            extractor = _media_extractor
+            minio_client = get_minio()
             
             # Check if file already uploaded (has minio_path)
             if media.minio_path:
-                # File already in MinIO (uploaded file)
-                # Just get duration
-                local_path = minio_client.download_audio(media.minio_path)
-                duration = extractor.get_audio_duration(local_path)
-                os.remove(local_path)
-                
-                media.duration = duration
-                job.progress_percent = 20
-                db.commit()
-                
-                return {
-                    'minio_path': media.minio_path,
-                    'duration': duration,
-                    'title': media.title
-                }
+                # File already in MinIO (uploaded file): fetch it once for
+                # the duration, the hash and transcription
+                audio_path = minio_client.download_audio(media.minio_path)
+                duration = extractor.get_audio_duration(audio_path)
             else:
                 # Download from URL (yt-dlp)
                 result = extractor.download_url(media.source_url)
                 audio_path = result['audio_path']
-                title = result['title']
+                media.title = result['title']
                 duration = result['duration']
-                media.title = title
                 
                 # Upload to MinIO
-                minio_path = minio_client.upload_audio(
+                media.minio_path = minio_client.upload_audio(
                     file_path=audio_path,
                     media_id=media.id
                 )
-                
-                # Update media item
-                media.minio_path = minio_path
-                media.duration = duration
-                job.progress_percent = 20
-                db.commit()
-                
-                # Clean up local file
-                os.remove(audio_path)
-                
-                return {
-                    'minio_path': minio_path,
-                    'duration': duration,
-                    'title': title
-                }
+            
+            # Keyed by job: a re-run of the same media can't clobber an in-flight hand-off
+            local_path = os.path.join(
+                settings.TEMP_DIR, f"job-{job_id}{os.path.splitext(audio_path)[1]}"
+            )
+            os.replace(audio_path, local_path)
+            
+            media.duration = duration
+            media.audio_hash = _deduplicator.generate_hash(local_path)
+            set_progress(job_id, 'extracting', 'Media Extraction', 20)
+            
+            return {
+                'minio_path': media.minio_path,
+                'duration': media.duration,
+                'title': media.title,
+                'audio_hash': media.audio_hash,
+                'local_path': local_path
+            }
             
         except Exception as e:
+            if local_path and os.path.exists(local_path):
+                os.remove(local_path)
             job.status = 'error'
             job.error_message = f"Extraction failed: {str(e)}"
             media.status = 'error'
@@ -163,66 +236,64 @@ def extract_media(self, job_id: str):
 @app.task(bind=True, name='backend.workers.tasks.check_duplicate')
 def check_duplicate(self, extract_result: dict, job_id: str):
     """
-    Step 2: Generate audio hash and check for duplicates
+    Step 2: Look up the audio hash from extract_media among completed items
     
-    Returns: extract_result if not duplicate, raises error if duplicate
+    Returns: extract_result (with 'local_path' for transcribe_audio) if not
+    duplicate. A duplicate ends the pipeline here
     """
+    local_path = extract_result.get('local_path')
     with get_db_context() as db:
-        job = db.query(ProcessingJob).filter(ProcessingJob.id == job_id).first()
-        media = db.query(MediaItem).filter(MediaItem.id == job.media_id).first()
+        job, media = _load_job_and_media(db, job_id)
         
-        job.status = 'hashing'
-        job.current_stage = 'Duplicate Check'
-        job.progress_percent = 30
-        db.commit()
+        set_progress(job_id, 'hashing', 'Duplicate Check', 30)
         
         try:
-            deduplicator = AudioDeduplicator()
-            minio_client = MinIOClient()
-            
-            # Download audio from MinIO
-            local_path = minio_client.download_audio(media.minio_path)
-            
-            # Generate audio hash
-            audio_hash = deduplicator.generate_hash(local_path)
-            media.audio_hash = audio_hash
-            db.commit()
+            minio_client = get_minio()
+            audio_hash = extract_result.get('audio_hash')
+            if audio_hash is None:
+                # Job queued before extract_media hashed: stream the object through the hash
+                audio_hash = _deduplicator.generate_hash(minio_client.iter_object(media.minio_path))
+                media.audio_hash = audio_hash
             
             # Check for duplicates
-            existing = db.query(MediaItem).filter(
-                MediaItem.audio_hash == audio_hash,
-                MediaItem.id != media.id,
-                MediaItem.status == 'completed'
+            existing = db.execute(
+                _SELECT_DUPLICATE, {'audio_hash': audio_hash, 'media_id': media.id}
             ).first()
             
             if existing:
-                # Duplicate found - link to existing
+                # Duplicate found - link to existing (content is read from it, not copied)
                 media.status = 'duplicate'
-                media.raw_text = existing.raw_text
-                media.transcript = existing.transcript
-                media.ai_summary = existing.ai_summary
-                media.tags = existing.tags
-                media.embedding = existing.embedding
+                media.duplicate_of = existing.id
+                # Same audio: keep one object in MinIO
+                own_path = None
+                if existing.minio_path and existing.minio_path != media.minio_path:
+                    own_path, media.minio_path = media.minio_path, existing.minio_path
                 job.status = 'completed'
                 job.current_stage = 'Duplicate (linked)'
                 job.progress_percent = 100
                 db.commit()
+                # Only once nothing can roll back to pointing at it
+                if own_path:
+                    try:
+                        minio_client.delete_audio(own_path)
+                    except Exception as e:
+                        print(f"⚠️  Failed to delete duplicate audio {own_path}: {e}")
+                if local_path and os.path.exists(local_path):
+                    os.remove(local_path)
                 
-                # Stop pipeline
-                raise Exception(f"Duplicate of media {existing.id}")
+                # Stop the pipeline: the remaining chain tasks are never dispatched
+                self.request.callbacks = None
+                self.request.chain = None
+                return {'status': 'duplicate', 'duplicate_of': existing.id}
             
-            # Not a duplicate - continue
-            job.progress_percent = 40
-            db.commit()
-            os.remove(local_path)
+            # Not a duplicate - local_path goes on to transcribe_audio (TEMP_DIR is shared)
+            set_progress(job_id, 'hashing', 'Duplicate Check', 40)
             
             return extract_result
             
         except Exception as e:
-            if "Duplicate of media" in str(e):
-                # This is expected - duplicate found
-                return None
-            # Real error
+            if local_path and os.path.exists(local_path):
+                os.remove(local_path)
             job.status = 'error'
             job.error_message = f"Deduplication failed: {str(e)}"
             media.status = 'error'
@@ -231,47 +302,38 @@ def check_duplicate(self, extract_result: dict, job_id: str):
 
 
 @app.task(bind=True, name='backend.workers.tasks.transcribe_audio')
-def transcribe_audio(self, dedup_result: Optional[dict], job_id: str):
+def transcribe_audio(self, dedup_result: dict, job_id: str):
     """
     Step 3: Transcribe audio using Whisper
     
-    Returns: dict with raw_text, transcript (speaker turns)
+    Returns: dict with media_id (raw_text and transcript go to the media row)
     """
-    if dedup_result is None:
-        # Skip if duplicate
-        return None
-    
+    local_path = dedup_result.get('local_path')
     with get_db_context() as db:
-        job = db.query(ProcessingJob).filter(ProcessingJob.id == job_id).first()
-        media = db.query(MediaItem).filter(MediaItem.id == job.media_id).first()
+        job, media = _load_job_and_media(db, job_id)
         
-        job.status = 'transcribing'
-        job.current_stage = 'Whisper Transcription'
-        job.progress_percent = 50
-        db.commit()
+        set_progress(job_id, 'transcribing', 'Whisper Transcription', 50)
         
         try:
-            whisper = WhisperService()
-            minio_client = MinIOClient()
+            whisper = get_whisper()
+            minio_client = get_minio()
             
-            # Download audio from MinIO
-            local_path = minio_client.download_audio(media.minio_path)
+            # Reuse the copy extract_media kept; if it is gone, read the
+            # object into memory (Whisper takes a buffer, no temp file)
+            if local_path and os.path.exists(local_path):
+                audio = local_path
+            else:
+                audio = minio_client.stream_object(media.minio_path)
             
             # Transcribe
-            result = whisper.transcribe(local_path)
+            result = whisper.transcribe(audio)
             
             # Update media
             media.raw_text = result['text']
             media.transcript = result['turns']
-            job.progress_percent = 70
-            db.commit()
+            set_progress(job_id, 'transcribing', 'Whisper Transcription', 70)
             
-            os.remove(local_path)
-            
-            return {
-                'raw_text': result['text'],
-                'transcript': result['turns']
-            }
+            return {'media_id': media.id}
             
         except Exception as e:
             job.status = 'error'
@@ -279,47 +341,44 @@ def transcribe_audio(self, dedup_result: Optional[dict], job_id: str):
             media.status = 'error'
             db.commit()
             raise
+        finally:
+            if local_path and os.path.exists(local_path):
+                os.remove(local_path)
 
 
 @app.task(bind=True, name='backend.workers.tasks.enrich_with_gemini')
-def enrich_with_gemini(self, transcribe_result: Optional[dict], job_id: str):
+def enrich_with_gemini(self, transcribe_result: dict, job_id: str):
     """
     Step 4: Enrich with Gemini (summary, tags, embeddings)
     
-    Returns: dict with ai_summary, tags, embedding
-    """
-    if transcribe_result is None:
-        return None
+    Reads the text the previous step committed to media.raw_text.
     
+    Returns: dict with ai_summary, tags
+    """
     with get_db_context() as db:
-        job = db.query(ProcessingJob).filter(ProcessingJob.id == job_id).first()
-        media = db.query(MediaItem).filter(MediaItem.id == job.media_id).first()
+        job, media = _load_job_and_media(db, job_id, with_text=True)
         
-        job.status = 'enriching'
-        job.current_stage = 'Gemini Analysis'
-        job.progress_percent = 80
-        db.commit()
+        set_progress(job_id, 'enriching', 'Gemini Analysis', 80)
         
         try:
-            gemini = GeminiService()
+            gemini = get_gemini_service()
             
-            # Get enrichment from Gemini
-            enrichment = gemini.enrich_transcript(transcribe_result['raw_text'])
-            
-            # Generate embedding
-            embedding = generate_embedding(transcribe_result['raw_text'])
+            # The embedding (local model) is computed while the Gemini
+            # request is in flight; both only read raw_text
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                embedding_future = pool.submit(generate_embedding, media.raw_text)
+                enrichment = gemini.enrich_transcript(media.raw_text)
+                embedding = embedding_future.result()
             
             # Update media
             media.ai_summary = enrichment['ai_summary']
             media.tags = enrichment['tags']
             media.embedding = embedding
-            job.progress_percent = 90
-            db.commit()
+            set_progress(job_id, 'enriching', 'Gemini Analysis', 90)
             
             return {
                 'ai_summary': enrichment['ai_summary'],
-                'tags': enrichment['tags'],
-                'embedding': embedding
+                'tags': enrichment['tags']
             }
             
         except Exception as e:
@@ -331,35 +390,45 @@ def enrich_with_gemini(self, transcribe_result: Optional[dict], job_id: str):
 
 
 @app.task(bind=True, name='backend.workers.tasks.finalize_processing')
-def finalize_processing(self, enrich_result: Optional[dict], job_id: str):
+def finalize_processing(self, enrich_result: dict, job_id: str):
     """
     Step 5: Finalize processing - mark as completed
     """
     with get_db_context() as db:
-        job = db.query(ProcessingJob).filter(ProcessingJob.id == job_id).first()
-        media = db.query(MediaItem).filter(MediaItem.id == job.media_id).first()
+        # Only the status changes: the media row is updated without loading it
+        job = db.execute(_SELECT_JOB, {'job_id': job_id}).scalar_one()
         
         if job.status != 'error':
-            if media.status != 'duplicate':
-                media.status = 'completed'
+            db.execute(
+                update(MediaItem).where(MediaItem.id == job.media_id).values(status='completed')
+            )
             job.status = 'completed'
             job.current_stage = 'Completed'
             job.progress_percent = 100
-            db.commit()
         
-        return {'status': 'completed', 'media_id': media.id}
+        return {'status': 'completed', 'media_id': job.media_id}
+
 
+# ISO 8601 dates (LLM output, Atom) vs RFC 2822 (RSS pubDate): pick the parser up front
+_ISO_DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
 
-def _parse_item_date(date_value: Optional[str]) -> Optional[datetime]:
-    if not date_value:
+
+def _parse_item_date(date_value: Any) -> Optional[datetime]:
+    # Values come from LLM output: anything but a non-empty string is no date
+    if not isinstance(date_value, str) or not date_value:
         return None
+    return _parse_date_string(date_value)
+
+
+@lru_cache(maxsize=4096)
+def _parse_date_string(date_value: str) -> Optional[datetime]:
+    # Cached: a feed's entries and the items extracted from them repeat dates
     try:
-        return datetime.fromisoformat(date_value.replace('Z', '+00:00'))
+        if _ISO_DATE_RE.match(date_value):
+            return datetime.fromisoformat(date_value.replace('Z', '+00:00'))
+        return parsedate_to_datetime(date_value)
     except Exception:
-        try:
-            return parsedate_to_datetime(date_value)
-        except Exception:
-            return None
+        return None
 
 
 def _normalize_text(value: str) -> str:
@@ -400,7 +469,31 @@ def _build_entry_date_index(entries: list[Dict[str, Any]]) -> Dict[str, datetime
 def process_subscription_task(self, subscription_id: str):
     """
     Process/sync a subscription - fetch new content and create media items
+    
+    One sync per subscription at a time: a second dispatch (beat plus a
+    manual sync) returns instead of repeating the extraction
+    """
+    lock_key = task_locks.subscription_lock_key(subscription_id)
+    lock_token = task_locks.acquire(lock_key, task_locks.SUBSCRIPTION_LOCK_TTL)
+    if lock_token is None:
+        return {'status': 'already_running', 'subscription_id': subscription_id}
+    try:
+        return _sync_subscription(subscription_id)
+    finally:
+        task_locks.release(lock_key, lock_token)
+
+
+def _subscription_fetch_scope(subscription: Subscription) -> str:
     """
+    fetch_cache key for a subscription's last synced validators: a changed
+    prompt or period needs a new extraction even if the feed didn't change
+    """
+    return json.dumps([
+        str(subscription.id), subscription.url, subscription.prompt, subscription.period_days or 7,
+    ])
+
+
+def _sync_subscription(subscription_id: str):
     with get_db_context() as db:
         subscription = db.query(Subscription).filter(
             Subscription.id == subscription_id
@@ -413,7 +506,7 @@ def process_subscription_task(self, subscription_id: str):
             return {'status': 'skipped', 'reason': 'sync disabled'}
         
         try:
-            extractor = WebExtractor()
+            extractor = _web_extractor
             result = extractor.extract(subscription.url)
             source_title = result.get('title') or subscription.title
             entries = result.get('entries') or []
@@ -432,7 +525,7 @@ def process_subscription_task(self, subscription_id: str):
             else:
                 content_text = result.get('text') or ''
 
-            gemini = GeminiService()
+            gemini = get_gemini_service()
             period_days = subscription.period_days or 7
             items = gemini.extract_feed_items(
                 source_title=source_title,
@@ -443,7 +536,6 @@ def process_subscription_task(self, subscription_id: str):
 
             now = datetime.utcnow()
             cutoff = now - timedelta(days=period_days)
-            created_ids = []
             source_type = 'rss_url' if entries else 'web_url'
             entry_date_index = _build_entry_date_index(entries) if entries else {}
             limit = _extract_limit_from_prompt(subscription.prompt)
@@ -480,49 +572,63 @@ def process_subscription_task(self, subscription_id: str):
             if limit is not None:
                 normalized_items = normalized_items[:limit]
 
-            for item in normalized_items:
-                title = item['title']
-                url = item['url']
-                summary = item['summary']
-                tags = item['tags']
-                item_date = item['date']
-
-                if not title or not summary or not url:
-                    continue
-                if require_date and not item_date:
-                    continue
-                if item_date and item_date < cutoff:
-                    continue
-
-                existing = db.query(MediaItem).filter(
-                    MediaItem.source_url == url,
-                    MediaItem.subscription_id == subscription_id
-                ).first()
-                if existing:
-                    continue
-
-                media_id = str(uuid4())
-                embedding = generate_embedding(summary) if summary else None
-                media_item = MediaItem(
-                    id=media_id,
-                    title=title,
-                    type='web',
-                    source_type=source_type,
-                    source_url=url,
-                    raw_text=summary,
-                    ai_summary=summary,
-                    tags=tags,
-                    embedding=embedding,
-                    status='completed',
-                    origin='subscription',
-                    subscription_id=subscription_id
-                )
-                db.add(media_item)
-                created_ids.append(media_id)
-
-            subscription.last_checked = now
+            candidates = [
+                item for item in normalized_items
+                if item['title'] and item['summary'] and item['url']
+                and (item['date'] or not require_date)
+                and not (item['date'] and item['date'] < cutoff)
+            ]
+
+            # Items already imported by an earlier sync, in one query
+            seen_urls = set()
+            if candidates:
+                seen_urls = {
+                    url for (url,) in db.query(MediaItem.source_url).filter(
+                        MediaItem.source_url.in_({item['url'] for item in candidates}),
+                        MediaItem.subscription_id == subscription_id
+                    )
+                }
+            new_items = []
+            for item in candidates:
+                if item['url'] not in seen_urls:
+                    seen_urls.add(item['url'])
+                    new_items.append(item)
+
+            # One batch for the new summaries; ones embedded before come from Redis
+            embeddings = generate_embeddings_cached([item['summary'] for item in new_items])
+
+            rows = [
+                {
+                    'id': str(uuid4()),
+                    'title': item['title'],
+                    'type': 'web',
+                    'source_type': source_type,
+                    'source_url': item['url'],
+                    'raw_text': item['summary'],
+                    'ai_summary': item['summary'],
+                    'tags': item['tags'],
+                    'embedding': embedding,
+                    'status': 'completed',
+                    'origin': 'subscription',
+                    'subscription_id': subscription_id,
+                }
+                for item, embedding in zip(new_items, embeddings)
+            ]
+            # ORM bulk INSERT: one multi-row statement, no per-object unit of work
+            if rows:
+                db.execute(insert(MediaItem), rows)
+            created_ids = [row['id'] for row in rows]
+
+            subscription.last_checked = func.now()
             db.commit()
 
+            # Only a committed sync may mark this feed as done: the next
+            # scheduled run skips the subscription while the URL answers 304
+            fetch_cache.store(
+                'subscription', _subscription_fetch_scope(subscription),
+                result.get('etag'), result.get('modified'), result=None
+            )
+
             return {
                 'status': 'processed',
                 'subscription_id': subscription_id,
@@ -530,7 +636,7 @@ def process_subscription_task(self, subscription_id: str):
             }
         
         except Exception as e:
-            subscription.last_checked = datetime.utcnow()
+            subscription.last_checked = func.now()
             db.commit()
             raise Exception(f"Failed to sync subscription: {str(e)}")
 
@@ -539,23 +645,44 @@ def process_subscription_task(self, subscription_id: str):
 def sync_subscriptions_task(self):
     """
     Sync all enabled subscriptions at most once per day.
+    
+    Due feeds are revalidated here, concurrently in one event loop, against
+    the validators their last successful sync stored; only the ones that
+    changed get a process_subscription_task. A manual sync always runs.
     """
     with get_db_context() as db:
-        now = datetime.utcnow()
-        cutoff = now - timedelta(days=1)
-        subscriptions = db.query(Subscription).filter(
-            Subscription.sync_enabled == True  # noqa: E712
+        cutoff = datetime.now(timezone.utc) - timedelta(days=1)
+        # Filter and claim in one statement: overlapping runs skip the rows
+        # another run has locked, and a claimed row is not due again for a day
+        due = select(Subscription.id).where(
+            Subscription.sync_enabled == True,  # noqa: E712
+            or_(Subscription.last_checked.is_(None), Subscription.last_checked <= cutoff)
+        ).with_for_update(skip_locked=True)
+        claimed = db.execute(
+            update(Subscription)
+            .where(Subscription.id.in_(due))
+            .values(last_checked=func.now())
+            .returning(
+                Subscription.id, Subscription.url, Subscription.prompt, Subscription.period_days
+            )
         ).all()
 
-        queued = 0
-        for subscription in subscriptions:
-            if subscription.last_checked and subscription.last_checked > cutoff:
-                continue
-            process_subscription_task.delay(subscription.id)
-            queued += 1
-
-        return {
-            'status': 'queued',
-            'queued': queued
-        }
-
+    # Claimed rows already carry last_checked: an unchanged feed needs no task
+    cached = fetch_cache.lookup_many(
+        [('subscription', _subscription_fetch_scope(row)) for row in claimed]
+    )
+    unchanged = _web_extractor.unchanged({
+        row.id: (row.url, entry) for row, entry in zip(claimed, cached) if entry
+    })
+    queued = 0
+    for row in claimed:
+        if row.id in unchanged:
+            continue
+        process_subscription_task.delay(row.id)
+        queued += 1
+
+    return {
+        'status': 'queued',
+        'queued': queued,
+        'unchanged': len(claimed) - queued
+    }
@@ -25,7 +25,7 @@ sleep 10
 
 # Initialize database
 echo "🗄️  Initializing database..."
-docker-compose exec -T gateway python -c "from backend.db.database import init_db; init_db()" || echo "Database already initialized"
+docker-compose exec -T gateway python -m backend.db.migrate || echo "Database already initialized"
 
 # Start all services
 echo "✅ Starting all services..."
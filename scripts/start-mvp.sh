@@ -66,6 +66,9 @@ for i in $(seq 1 30); do
 done
 
 # ─── 4. Gateway (FastAPI) ─────────────────────────────────────────────────────
+echo "🗄️  Применяем схему БД..."
+python3 -m backend.db.migrate
+
 echo "🌐 Запускаем Gateway (FastAPI)..."
 nohup python3 -m uvicorn backend.gateway.main:app \
     --host 0.0.0.0 \